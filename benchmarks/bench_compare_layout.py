@@ -0,0 +1,114 @@
+"""Benchmark comparison image layout and rendering.
+
+Compares the cached single-pass layout against the previous approach, which
+measured every growing prefix of a line and wrapped every description twice.
+
+Usage:
+    python -m benchmarks.bench_compare_layout [--items N] [--aspects N] [--words N]
+"""
+
+import argparse
+import random
+import time
+
+from fiber.prompts.compare.compare_utils import (
+    ComparisonPoint, ComparisonResult, ImageGenerator
+)
+
+WORDS = (
+    "performance latency throughput memory allocation garbage collector runtime "
+    "compiler interpreter ecosystem library package concurrency parallelism async "
+    "typing safety tooling community adoption learning curve syntax readability"
+).split()
+
+
+def make_result(items: int, aspects: int, words: int) -> ComparisonResult:
+    """Build a synthetic comparison with long descriptions."""
+    rng = random.Random(42)
+
+    def sentence(n):
+        return ' '.join(rng.choice(WORDS) for _ in range(n))
+
+    return ComparisonResult(
+        items=[f"Item {i}" for i in range(1, items + 1)],
+        points=[
+            ComparisonPoint(
+                aspect=f"Aspect {a}",
+                descriptions=[sentence(words) for _ in range(items)],
+                similarities=sentence(words // 2),
+                differences=sentence(words // 2)
+            )
+            for a in range(1, aspects + 1)
+        ],
+        summary=sentence(words * 2),
+        recommendation=sentence(words)
+    )
+
+
+def legacy_wrap(font, text: str, max_width: int):
+    """The previous wrap: measure the whole line again after every word."""
+    lines, current_line = [], []
+    for word in text.split():
+        current_line.append(word)
+        bbox = font.getbbox(' '.join(current_line))
+        if bbox[2] - bbox[0] > max_width:
+            if len(current_line) == 1:
+                lines.append(' '.join(current_line))
+                current_line = []
+            else:
+                current_line.pop()
+                lines.append(' '.join(current_line))
+                current_line = [word]
+    if current_line:
+        lines.append(' '.join(current_line))
+    return lines
+
+
+def legacy_layout(generator: ImageGenerator, result: ComparisonResult):
+    """Wrap every block twice, once for the height and once for drawing."""
+    content_width = generator.width - 2 * generator.padding
+    col_width = (content_width - generator.padding) // len(result.items)
+    blocks = []
+    for point in result.points:
+        blocks.extend((desc, col_width - generator.padding) for desc in point.descriptions)
+        blocks.append((f"Similarities: {point.similarities}", content_width))
+        blocks.append((f"Differences: {point.differences}", content_width))
+    blocks.append((result.summary, content_width))
+    blocks.append((result.recommendation, content_width))
+    for _ in range(2):
+        for text, width in blocks:
+            legacy_wrap(generator.text_font, text, width)
+
+
+def best_of(runs: int, func) -> float:
+    """Get the fastest of several timed runs in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=6)
+    parser.add_argument('--aspects', type=int, default=12)
+    parser.add_argument('--words', type=int, default=120)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    result = make_result(args.items, args.aspects, args.words)
+
+    legacy = best_of(args.runs, lambda: legacy_layout(ImageGenerator(), result))
+    layout = best_of(args.runs, lambda: ImageGenerator().layout_comparison(result))
+    render = best_of(args.runs, lambda: ImageGenerator().generate_comparison_image(result))
+
+    print(f"{args.items} items x {args.aspects} aspects, {args.words} words per description")
+    print(f"legacy wrap (x2):   {legacy:9.1f} ms")
+    print(f"cached layout:      {layout:9.1f} ms  ({legacy / layout:.1f}x faster)")
+    print(f"layout + rasterize: {render:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
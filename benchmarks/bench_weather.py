@@ -0,0 +1,141 @@
+"""Exercise the weather provider against a local stand-in OpenWeatherMap server.
+
+Runs a small HTTP server that answers /weather like OpenWeatherMap after a
+simulated delay, then checks the batch, cache and TTL paths of
+WeatherProvider against it: looking cities up one by one versus
+concurrently, repeated lookups answered from the cache, spellings of the
+same city sharing one request, and entries refetched once they expire.
+
+Usage:
+    python -m benchmarks.bench_weather [--cities N] [--latency SECONDS]
+"""
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from prompts.weather.weather import WeatherProvider, normalize_city
+
+CITIES = [
+    "London", "Paris", "Tokyo", "New York", "Berlin", "Madrid", "Rome", "Cairo",
+    "Sydney", "Toronto", "Mumbai", "Seoul", "Lima", "Nairobi", "Oslo", "Dublin"
+]
+
+
+class StandInWeatherServer:
+    """Local server answering /weather with fixed conditions after a delay."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = Counter()
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                city = parse_qs(url.query).get('q', [''])[0]
+                with server._lock:
+                    server.requests[normalize_city(city)] += 1
+                time.sleep(server.latency)
+                if url.path != '/weather' or city.lower() == 'nowhere':
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = json.dumps({
+                    "main": {"temp": 12.5, "humidity": 70},
+                    "weather": [{"description": f"clear sky over {city}"}],
+                    "wind": {"speed": 3.4}
+                }).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def total(self) -> int:
+        with self._lock:
+            return sum(self.requests.values())
+
+
+def timed(func):
+    """Run a function and get its result with the elapsed time in milliseconds."""
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cities', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.2)
+    args = parser.parse_args()
+
+    cities = CITIES[:max(1, min(args.cities, len(CITIES)))]
+
+    with StandInWeatherServer(args.latency) as server, tempfile.TemporaryDirectory() as tmp:
+        def provider(ttl: float = 600, cache: str = 'weather.json') -> WeatherProvider:
+            return WeatherProvider(api_key='stand-in', base_url=server.base_url,
+                                   ttl=ttl, cache_file=Path(tmp) / cache)
+
+        serial_provider = provider(cache='serial.json')
+        _, serial = timed(lambda: [serial_provider.get(city) for city in cities])
+
+        batch_provider = provider()
+        results, batch = timed(lambda: batch_provider.get_many(cities))
+        assert all(weather for _, weather in results), "every city should resolve"
+        fetched = server.total()
+
+        # Answered from memory, then from the cache file by a fresh provider
+        _, cached = timed(lambda: batch_provider.get_many(cities))
+        provider().get_many(cities)
+        assert server.total() == fetched, "cached cities must not be fetched again"
+
+        # Spellings of one city share a single request
+        before = server.total()
+        provider(cache='spellings.json').get_many(["Lisbon", " lisbon ", "LISBON?"])
+        assert server.total() - before == 1, "one request per distinct city"
+
+        # Failures are not cached, so they are retried
+        before = server.total()
+        assert provider().get_many(["Nowhere"])[0][1] is None
+        assert provider().get_many(["Nowhere"])[0][1] is None
+        assert server.total() - before == 2, "failed cities must be fetched again"
+
+        # Expired entries are fetched again
+        short = provider(ttl=0.5, cache='ttl.json')
+        short.get(cities[0])
+        time.sleep(0.6)
+        before = server.total()
+        short.get(cities[0])
+        assert server.total() - before == 1, "expired entries must be refetched"
+
+    print(f"{len(cities)} cities, {args.latency * 1000:.0f} ms simulated API latency")
+    print(f"one by one:         {serial:9.1f} ms")
+    print(f"get_many:           {batch:9.1f} ms  ({serial / batch:.1f}x faster)")
+    print(f"get_many (cached):  {cached:9.1f} ms  (0 requests)")
+    print("spellings of one city share a request; failures retry; expired entries refetch")
+
+
+if __name__ == '__main__':
+    main()
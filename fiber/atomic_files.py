@@ -0,0 +1,92 @@
+"""Atomic file writes shared by Fiber's caches, notes and documents.
+
+Files are written next to their destination and renamed into place, so a
+reader never sees a partial file and a failed write never replaces an
+existing one.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Union
+
+PathLike = Union[str, Path]
+
+
+def write_atomic(path: PathLike, data: bytes):
+    """Write a file atomically so concurrent readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json(path: PathLike, data: Any, indent: Optional[int] = None):
+    """Write JSON atomically."""
+    write_atomic(path, json.dumps(data, indent=indent).encode('utf-8'))
+
+
+def reserve_path(path: PathLike) -> str:
+    """
+    Claim a file path that no other writer can get.
+
+    The file is created empty; if the name is taken, a counter is added
+    before the extension ("notes.md", "notes_2.md", ...).
+
+    Returns:
+        The reserved path
+    """
+    root, ext = os.path.splitext(str(path))
+    candidate, counter = str(path), 1
+    while True:
+        try:
+            with open(candidate, 'x', encoding='utf-8'):
+                return candidate
+        except FileExistsError:
+            counter += 1
+            candidate = f"{root}_{counter}{ext}"
+
+
+class AtomicTextFile:
+    """
+    Text file written incrementally and renamed into place once complete.
+
+    The text goes to a `.part` file next to the destination; `commit` moves
+    it over the destination and `discard` removes it, leaving any existing
+    file untouched.
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = str(path)
+        self.tmp_path = f"{self.path}.part"
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+
+    def write(self, text: str):
+        self.file.write(text)
+
+    def flush(self):
+        self.file.flush()
+
+    def commit(self) -> str:
+        """Move the finished file into place and return its path."""
+        try:
+            self.file.close()
+            os.replace(self.tmp_path, self.path)
+        except BaseException:
+            self.discard()
+            raise
+        return self.path
+
+    def discard(self):
+        """Remove the partial file."""
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
@@ -17,11 +17,13 @@ import re
 import json
 
 from fiber.session import Session, prompt_history
+from fiber.local_index import add_document, search_local
+from fiber.token_budget import TokenBudget
 from fiber.system_context import context
 from prompts.weather.weather import get_weather, format_weather_response
 from prompts.time.time_utils import get_current_time, format_time_response
-from prompts.creator.creator import create_document, format_content, open_document
-from prompts.summarizer.summarizer import format_summary
+from prompts.creator.creator import DocumentWriter, open_document
+from prompts.summarizer.summarizer import format_summary, prefetch_articles, read_url_list, summarize_urls
 
 # Create console for terminal output
 console = Console() if sys.stdout.isatty() else None
@@ -138,12 +140,15 @@ def process_command(cmd: str) -> None:
         if not response_text:
             try:
                 model = os.getenv('OLLAMA_MODEL', 'mistral')
+                budget = TokenBudget(model)
+                prompt = budget.fit(cmd)
                 response = requests.post(
                     "http://localhost:11434/api/generate",
                     json={
                         "model": model,
-                        "prompt": cmd,
-                        "stream": False
+                        "prompt": prompt,
+                        "stream": False,
+                        "options": budget.options(prompt)
                     }
                 )
                 
@@ -185,8 +190,10 @@ def handle_weather_query(query: str) -> str:
 
 def handle_time_query(query: str) -> str:
     """Handle time-related queries."""
-    # Extract timezone from query using simple pattern matching
-    tz_match = re.search(r"time (?:in|at|for)?\s+([a-zA-Z\s/]+)", query.lower())
+    # Extract the place from queries like "time in tokyo" or "what time is it in new york?"
+    query = query.lower().strip(' ?!.')
+    tz_match = (re.search(r"\b(?:in|at|for)\s+([a-z][a-z\s/_.'-]*)$", query)
+                or re.search(r"time\s+(?!is\b)([a-z][a-z\s/_.'-]*)$", query))
     timezone = None
     if tz_match:
         timezone = tz_match.group(1).strip()
@@ -196,10 +203,6 @@ def handle_time_query(query: str) -> str:
         return format_time_response(time_data)
     return None
 
-def count_words(text: str) -> int:
-    """Count words in text."""
-    return len(text.split())
-
 def format_time(seconds: int) -> str:
     """Format seconds into MM:SS."""
     minutes = seconds // 60
@@ -226,22 +229,25 @@ def handle_document_creation(prompt: str) -> Tuple[bool, Optional[str]]:
             # Get content from Ollama
             try:
                 model = os.getenv('OLLAMA_MODEL', 'mistral')
+                prompt_text = f"""Write detailed, well-structured notes about {topic}.
+Include relevant examples and explanations.
+Make the content clear, concise, and well-organized.
+Focus on the most important concepts and explain them well."""
+                budget = TokenBudget(model, output_tokens=2048)
                 response = requests.post(
                     "http://localhost:11434/api/generate",
                     json={
                         "model": model,
-                        "prompt": f"""Write detailed, well-structured notes about {topic}.
-Include relevant examples and explanations.
-Make the content clear, concise, and well-organized.
-Focus on the most important concepts and explain them well.""",
-                        "stream": True
+                        "prompt": prompt_text,
+                        "stream": True,
+                        "options": budget.options(prompt_text)
                     },
                     stream=True
                 )
                 
                 if response.status_code == 200:
-                    content = []
-                    accumulated_text = ""
+                    # Written to disk as it streams rather than held in memory
+                    writer = DocumentWriter(topic)
                     start_time = time.time()
                     last_update = 0
                     target_words = 500  # Target word count
@@ -251,52 +257,55 @@ Focus on the most important concepts and explain them well.""",
                     else:
                         console.print("[bold blue]Fiber:[/bold blue] Writing content...")
                     
-                    for line in response.iter_lines():
-                        if line:
-                            try:
-                                json_response = json.loads(line.decode())
-                                if 'response' in json_response:
-                                    chunk = json_response['response']
-                                    content.append(chunk)
-                                    accumulated_text += chunk
-                                    
-                                    # Update progress less frequently (every 0.5 seconds)
-                                    current_time = time.time()
-                                    if current_time - last_update >= 0.5:
-                                        current_words = count_words(accumulated_text)
-                                        progress = min(100, int((current_words / target_words) * 100))
-                                        elapsed = format_time(int(current_time - start_time))
-                                        
-                                        # Clear previous line and write new progress
-                                        if WEB_MODE:
-                                            print("\033[K", end="\r", file=sys.stderr)  # Clear the current line
-                                            print(f"Progress: {progress}% • {elapsed}", end="\r", file=sys.stderr)
-                                        else:
-                                            console.print(f"[bold blue]Progress:[/bold blue] {progress}% • {elapsed}", end="\r")
-                                        last_update = current_time
+                    finished = False
+                    try:
+                        for line in response.iter_lines():
+                            if line:
+                                try:
+                                    json_response = json.loads(line.decode())
+                                    if 'response' in json_response:
+                                        chunk = json_response['response']
+                                        writer.write(chunk)
                                         
-                                    if json_response.get('done', False):
-                                        break
-                            except json.JSONDecodeError:
-                                continue
-                    
-                    # Move to next line after progress is done
-                    if WEB_MODE:
-                        print("", file=sys.stderr)
-                    else:
-                        console.print()
-                    
-                    if content:
-                        final_content = "".join(content)
-                        formatted_content = format_content(topic, final_content)
-                        file_path = create_document(topic, formatted_content)
+                                        # Update progress less frequently (every 0.5 seconds)
+                                        current_time = time.time()
+                                        if current_time - last_update >= 0.5:
+                                            current_words = writer.words
+                                            progress = min(100, int((current_words / target_words) * 100))
+                                            elapsed = format_time(int(current_time - start_time))
+                                            
+                                            # Clear previous line and write new progress
+                                            if WEB_MODE:
+                                                print("\033[K", end="\r", file=sys.stderr)  # Clear the current line
+                                                print(f"Progress: {progress}% • {elapsed}", end="\r", file=sys.stderr)
+                                            else:
+                                                console.print(f"[bold blue]Progress:[/bold blue] {progress}% • {elapsed}", end="\r")
+                                            last_update = current_time
+                                            
+                                        if json_response.get('done', False):
+                                            break
+                                except json.JSONDecodeError:
+                                    continue
+                        
+                        # Move to next line after progress is done
+                        if WEB_MODE:
+                            print("", file=sys.stderr)
+                        else:
+                            console.print()
                         
-                        if file_path:
-                            if WEB_MODE:
-                                print(f"I have completed writing about: {topic} ({count_words(final_content)} words). Would you like me to open the document for you? (y/n)", file=sys.stderr)
-                            else:
-                                console.print(f"\n[bold blue]Fiber:[/bold blue] I have completed writing about: {topic} ({count_words(final_content)} words). Would you like me to open the document for you? (y/n)")
-                            return True, file_path
+                        file_path = writer.close(success=True)
+                        finished = True
+                    finally:
+                        # Also runs on Ctrl-C, so no .part file is left in the notes folder
+                        if not finished:
+                            writer.close(success=False)
+                    
+                    if file_path:
+                        if WEB_MODE:
+                            print(f"I have completed writing about: {topic} ({writer.words} words). Would you like me to open the document for you? (y/n)", file=sys.stderr)
+                        else:
+                            console.print(f"\n[bold blue]Fiber:[/bold blue] I have completed writing about: {topic} ({writer.words} words). Would you like me to open the document for you? (y/n)")
+                        return True, file_path
                             
             except Exception as e:
                 error = f"Error creating document: {str(e)}"
@@ -310,12 +319,16 @@ Focus on the most important concepts and explain them well.""",
 def call_ollama(prompt, timeout=45):
     """Call Ollama API with better error handling and timeout."""
     try:
+        model = os.getenv('OLLAMA_MODEL', 'mistral')
+        budget = TokenBudget(model)
+        prompt = budget.fit(prompt)
         response = requests.post(
             "http://localhost:11434/api/generate",
             json={
-                "model": os.getenv('OLLAMA_MODEL', 'mistral'),
+                "model": model,
                 "prompt": prompt,
-                "stream": False
+                "stream": False,
+                "options": budget.options(prompt)
             },
             timeout=timeout
         )
@@ -455,28 +468,83 @@ def ask(prompt):
     process_command(prompt)
 
 @cli.command()
-@click.argument('url', required=True)
-def summarize(url: str):
-    """Summarize a webpage article."""
-    result = format_summary(url)
-    if result:
+@click.argument('url', required=False)
+@click.option('--from-file', 'url_file', type=click.File('r'),
+              help="Summarize every URL listed in a file ('-' for stdin) without prompts")
+@click.option('--jsonl', 'jsonl_path', type=click.Path(dir_okay=False),
+              help='Append bulk summaries to a JSONL file instead of writing notes')
+@click.option('--fetch-workers', default=8, type=int, help='Pages downloaded at the same time')
+@click.option('--per-host', default=2, type=int, help='Simultaneous downloads from one host')
+@click.option('--llm-workers', default=2, type=int, help='Summaries generated at the same time')
+@click.option('--save/--no-save', default=None,
+              help='Write the note while the summary streams in, or skip saving (default: ask)')
+@click.option('--watch', is_flag=True,
+              help='Summarize only what changed since the last --watch run of this URL')
+def summarize(url: str, url_file, jsonl_path, fetch_workers, per_host, llm_workers, save, watch):
+    """Summarize a webpage article.
+    
+    Examples:
+    - summarize https://example.com/article
+    - summarize --from-file links.txt
+    - cat links.txt | summarize --from-file - --jsonl digest.jsonl
+    - summarize https://status.example.com --watch
+    """
+    if url_file:
+        urls = read_url_list(url_file)
+        if not urls:
+            raise click.UsageError("No URLs found in the input")
+        counts = summarize_urls(urls, jsonl_path, fetch_workers, per_host, llm_workers)
         if console:
-            console.print(Markdown(result))
+            console.print(f"\n[bold]Summarized {counts['saved']} of {len(urls)} pages[/bold]")
+        return
+    
+    if not url:
+        raise click.UsageError("Missing argument 'URL' (or use --from-file)")
+    
+    if watch:
+        from prompts.summarizer.watch import watch_summary
+        watch_summary(url)
+        return
+    
+    format_summary(url, save)
 
 @cli.command()
-@click.argument('query')
-def search(query):
+@click.argument('query', required=False)
+@click.option('--prefetch', default=0, type=int,
+              help='Download and extract the top N results in the background for a later summarize')
+@click.option('--prefetch-workers', default=3, type=int,
+              help='Maximum number of pages prefetched at the same time')
+@click.option('--local', 'local', is_flag=True,
+              help='Search offline in pages, notes, documents and comparisons Fiber has seen')
+@click.option('--engines-status', is_flag=True,
+              help='Show the health and circuit breaker state of each search engine')
+def search(query, prefetch, prefetch_workers, local, engines_status):
     """Search for information and open results in browser.
     
     Examples:
     - search "python web development"
     - search "history of the silk road"
     - search "machine learning basics"
+    - search "rust async runtimes" --prefetch 3
+    - search "event loop" --local
+    - search --engines-status
     """
+    prefetcher = None
     try:
+        if engines_status:
+            print_engine_status()
+            return
+        
+        if not query:
+            raise click.UsageError("Missing argument 'QUERY'")
+        
         # Remove quotes from query
         query = query.strip('"\'')
         
+        if local:
+            search_local_index(query)
+            return
+        
         if console:
             console.print("\n[bold]🔍 Searching...[/bold]\n")
         
@@ -487,6 +555,10 @@ def search(query):
             if console:
                 console.print("[red]No results found[/red]")
             return
+        
+        # Start extracting the top results while they are being displayed
+        if prefetch > 0:
+            prefetcher = prefetch_articles([r['url'] for r in results[:prefetch]], prefetch_workers)
             
         # Display results
         if console:
@@ -510,6 +582,76 @@ def search(query):
             console.print(f"[red]{error}[/red]")
         else:
             print(error, file=sys.stderr)
+    finally:
+        if prefetcher:
+            if console:
+                with console.status("[bold blue]Prefetching top results for summarize..."):
+                    prefetcher.shutdown(wait=True)
+                console.print("[green]✓ Top results cached for summarize[/green]")
+            else:
+                prefetcher.shutdown(wait=True)
+
+def print_engine_status():
+    """Display health and circuit breaker state of the search engines."""
+    from rich.table import Table
+    from fiber.prompts.search.search_utils import get_engine_status
+    
+    status = get_engine_status()
+    if not console:
+        for engine in status:
+            print(f"{engine['name']}\t{engine['state']}\t{engine['last_error']}")
+        return
+    
+    table = Table(title="Search Engine Health")
+    table.add_column("Engine", style="bold blue")
+    table.add_column("State")
+    table.add_column("Searches", justify="right")
+    table.add_column("Avg Latency", justify="right")
+    table.add_column("Errors", justify="right")
+    table.add_column("Empty", justify="right")
+    table.add_column("Next Probe")
+    table.add_column("Last Error", style="dim")
+    
+    state_styles = {'closed': 'green', 'open': 'red', 'half-open': 'yellow'}
+    for engine in status:
+        style = state_styles.get(engine['state'], 'white')
+        next_probe = ''
+        if engine['retry_at']:
+            next_probe = time.strftime('%H:%M:%S', time.localtime(engine['retry_at']))
+        table.add_row(
+            engine['name'],
+            f"[{style}]{engine['state']}[/{style}]",
+            str(engine['samples']),
+            f"{engine['avg_latency']:.2f}s",
+            f"{engine['error_rate']:.0%}",
+            f"{engine['empty_rate']:.0%}",
+            next_probe,
+            engine['last_error']
+        )
+    console.print(table)
+
+def search_local_index(query: str, limit: int = 10):
+    """Search the local full-text index and display ranked results."""
+    start = time.perf_counter()
+    results = search_local(query, limit=limit)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    if not results:
+        if console:
+            console.print("[red]No local results found[/red]")
+        else:
+            print("No local results found", file=sys.stderr)
+        return
+    
+    if console:
+        console.print(f"\n[bold]Local Results[/bold] ({len(results)} in {elapsed_ms:.1f} ms):\n")
+        for i, result in enumerate(results, 1):
+            console.print(f"[bold blue]{i}. {result.title}[/bold blue] [dim]({result.kind})[/dim]")
+            console.print(f"   {result.snippet}")
+            console.print(f"   {result.key}\n")
+    else:
+        for result in results:
+            print(f"{result.title}\t{result.kind}\t{result.key}")
 
 def search_web(query):
     """Search the web using DuckDuckGo."""
@@ -544,6 +686,17 @@ def search_web(query):
                         'source': 'DuckDuckGo'
                     })
         
+        # No instant answers, fall back to the healthy search engines
+        if not results:
+            from fiber.prompts.search.search_utils import get_ranked_results
+            for result, source in get_ranked_results(query)[:5]:
+                results.append({
+                    'title': result.title,
+                    'description': result.description,
+                    'url': result.url,
+                    'source': source
+                })
+        
         return results
     except Exception as e:
         print(f"Search error: {str(e)}")
@@ -551,7 +704,11 @@ def search_web(query):
 
 @cli.command()
 @click.argument('items', nargs=-1, required=True)
-def compare(items):
+@click.option('--no-image', is_flag=True, help='Skip rendering the comparison image')
+@click.option('--format', 'fmt', type=click.Choice(['png', 'svg', 'html']), default='png',
+              show_default=True, help='Output format of the saved comparison')
+@click.option('--refresh', is_flag=True, help='Regenerate instead of using a cached comparison')
+def compare(items, no_image, fmt, refresh):
     """Compare different theories, ideas, or arguments side-by-side.
     
     Example: compare "Python" "JavaScript" "Ruby"
@@ -566,20 +723,32 @@ def compare(items):
         
     try:
         if console:
-            with console.status("[bold blue]Working on comparison...") as status:
-                # Get comparison
-                status.update("[bold blue]Analyzing and comparing items...")
-                from fiber.prompts.compare.compare_utils import get_comparison, display_comparison, save_comparison_image
-                result = get_comparison(list(items))
-                
-                # Generate and save image
-                status.update("[bold blue]Generating comparison image...")
-                image_path = save_comparison_image(result)
-                
-                # Display results
-                console.print("\n")  # Add some spacing
-                display_comparison(result)
-                console.print(f"\n[bold green]Comparison image saved:[/bold green] {image_path}")
+            from fiber.prompts.compare.compare_utils import (
+                get_comparison, display_comparison, format_comparison_text,
+                get_comparison_image_path, save_comparison_image_async
+            )
+            from fiber.prompts.compare.comparison_cache import comparison_index_key
+            # The table grows row by row while the model streams; only one live
+            # display can run at a time, so there is no outer spinner here
+            console.print()
+            result = get_comparison(list(items), live=True, use_cache=not refresh)
+            
+            # Display the summary before any rendering happens
+            display_comparison(result, show_table=False)
+            
+            # Render the image in the background while the result is indexed
+            image_future = None
+            if not no_image:
+                image_path = get_comparison_image_path(result, extension=fmt)
+                image_future = save_comparison_image_async(result, filepath=image_path, fmt=fmt)
+            # Keyed by the item set, so reruns in any order replace the indexed comparison
+            add_document(comparison_index_key(result.items), 'comparison', ' vs '.join(result.items),
+                         format_comparison_text(result))
+            
+            if image_future:
+                with console.status(f"[bold blue]Rendering comparison {fmt.upper()}..."):
+                    image_path = image_future.result()
+                console.print(f"\n[bold green]Comparison {fmt.upper()} saved:[/bold green] {image_path}")
                 
     except Exception as e:
         error = f"Error: {str(e)}"
@@ -589,31 +758,52 @@ def compare(items):
             print(error, file=sys.stderr)
 
 @cli.command()
-@click.argument('word', required=True)
-def define(word):
-    """Get a simple definition of a word.
+@click.argument('words', nargs=-1)
+@click.option('--import', 'import_file', type=click.Path(exists=True, dir_okay=False),
+              help='Import a word list (.csv, .tsv, .json, .jsonl) into the offline dictionary')
+def define(words, import_file):
+    """Get a simple definition of one or more words.
     
-    Example: define "ephemeral"
+    Examples:
+    - define "ephemeral"
+    - define serendipity ubiquitous ephemeral
     """
     try:
-        from fiber.prompts.define.define_utils import get_word_definition
-        
-        # Get definition
-        definition = get_word_definition(word)
+        from fiber.prompts.define.define_utils import define_words
         
-        if definition:
+        if import_file:
+            from fiber.prompts.define.dictionary_store import dictionary_size, import_dictionary
+            count = import_dictionary(import_file)
+            message = f"Read {count} entries; the offline dictionary now has {dictionary_size()} words."
             if console:
-                console.print(f"\n[bold]{word}:[/bold] {definition}")
+                console.print(f"[green]{message}[/green]")
             else:
-                # Web mode - just print the definition
-                print(definition)
-        else:
-            error = f"Could not find definition for '{word}'"
-            if console:
-                console.print(f"\n[red]{error}[/red]")
+                print(message)
+            if not words:
+                return
+        
+        if not words:
+            raise click.UsageError("Please provide a word to define")
+        
+        # Words are looked up concurrently and printed in order as they resolve
+        for word, definition in define_words(list(words)):
+            if definition:
+                if console:
+                    console.print(f"\n[bold]{word}:[/bold] {definition}")
+                elif len(words) > 1:
+                    print(f"{word}: {definition}")
+                else:
+                    # Web mode - just print the definition
+                    print(definition)
             else:
-                print(error, file=sys.stderr)
+                error = f"Could not find definition for '{word}'"
+                if console:
+                    console.print(f"\n[red]{error}[/red]")
+                else:
+                    print(error, file=sys.stderr)
             
+    except click.UsageError:
+        raise
     except Exception as e:
         error = f"Error: {str(e)}"
         if console:
@@ -623,32 +813,38 @@ def define(word):
 
 @cli.command()
 @click.argument('topic')
-def brainstorm(topic):
+@click.option('--type', 'category', type=click.Choice(['general', 'project', 'assignment', 'writing']),
+              default='general', show_default=True, help='Kind of ideas to generate')
+@click.option('--samples', type=click.IntRange(1, 16), default=None,
+              help='Concurrent generations to draw ideas from (default: FIBER_BRAINSTORM_SAMPLES or 4)')
+def brainstorm(topic, category, samples):
     """Generate creative ideas based on a topic.
     
     Examples:
     - brainstorm "artificial intelligence"
-    - brainstorm "climate change"
-    - brainstorm "medieval history"
+    - brainstorm "climate change" --type project
+    - brainstorm "medieval history" --type writing
     """
     try:
+        from fiber.prompts.brainstorm.brainstorm_utils import (
+            BRAINSTORM_SAMPLES, generate_ideas, display_ideas
+        )
+        
         # Remove any extra quotes from the topic
         topic = topic.strip('"\'')
-        prompt = f'Brainstorm 5 creative and unique ideas related to "{topic}". Format as a numbered list.'
+        ideas = generate_ideas(topic, category, count=5, samples=samples or BRAINSTORM_SAMPLES,
+                               live=bool(console))
         
         if console:
-            with console.status("[bold blue]Brainstorming ideas..."):
-                ideas = call_ollama(prompt)
-                if ideas:
-                    console.print(f"\n[bold]Ideas for {topic}:[/bold]\n")
-                    console.print(Markdown(ideas))
-                else:
-                    console.print("\n[red]No ideas generated[/red]")
+            if ideas:
+                display_ideas(ideas, topic, category)
+            else:
+                console.print("\n[red]No ideas generated[/red]")
         else:
             # Web mode - direct output
-            ideas = call_ollama(prompt)
             if ideas:
-                print(ideas)
+                for i, idea in enumerate(ideas, 1):
+                    print(f"{i}. {idea.title}: {idea.description}")
             else:
                 print("No ideas generated", file=sys.stderr)
                 
@@ -659,6 +855,53 @@ def brainstorm(topic):
         else:
             print(error, file=sys.stderr)
 
+@cli.command()
+@click.argument('cities', nargs=-1, required=True)
+def weather(cities):
+    """Get the current weather of one or more cities.
+    
+    Examples:
+    - weather London
+    - weather London Paris Tokyo
+    - weather "New York" "Sao Paulo"
+    """
+    try:
+        from prompts.weather.weather import get_weather_many
+        
+        for city, weather_data in get_weather_many(list(cities)):
+            if not weather_data:
+                continue
+            response_text = format_weather_response(weather_data)
+            if console:
+                console.print(f"[bold]{city}:[/bold] {response_text}")
+            else:
+                print(f"{city}: {response_text}")
+                
+    except Exception as e:
+        error = f"Error: {str(e)}"
+        if console:
+            console.print(f"[red]{error}[/red]")
+        else:
+            print(error, file=sys.stderr)
+
+@cli.command(name='time')
+@click.argument('place', nargs=-1)
+def time_command(place):
+    """Get the current time, optionally for a city, country or timezone.
+    
+    Examples:
+    - time tokyo
+    - time new york
+    - time pst
+    """
+    time_data = get_current_time(' '.join(place) or None)
+    if time_data:
+        response_text = format_time_response(time_data)
+        if console:
+            console.print(response_text)
+        else:
+            print(response_text)
+
 @cli.command()
 @click.argument('message', type=str)
 def chat(message):
@@ -0,0 +1,54 @@
+"""Generation limits for each kind of Ollama request.
+
+Every command knows roughly how long a useful answer is. Its profile caps
+the generated tokens (`num_predict`) and sets stop sequences, so the model
+never keeps generating past the answer. Caps can be overridden with
+FIBER_NUM_PREDICT_<NAME>, for example FIBER_NUM_PREDICT_COMPARE=4096.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    name: str
+    num_predict: int
+    stop: Tuple[str, ...] = ()
+
+    def options(self, base: Optional[Dict] = None) -> Dict:
+        """Get Ollama options for this profile, merged over base options such as num_ctx."""
+        options = dict(base or {})
+        options['num_predict'] = self.num_predict
+        if self.stop:
+            options['stop'] = list(self.stop)
+        return options
+
+
+PROFILES = {
+    # One JSON object with a single sentence; it is finished at the first closing brace
+    'define': GenerationProfile('define', num_predict=96, stop=('}',)),
+    # Per idea: a title and a one-line description
+    'brainstorm_idea': GenerationProfile('brainstorm_idea', num_predict=80),
+    # Per item compared: its description in each of the capped aspect rows, plus the verdict
+    'compare': GenerationProfile('compare', num_predict=1024),
+    'compare_aspects': GenerationProfile('compare_aspects', num_predict=160),
+    # Per pair of items compared in one aspect row
+    'compare_row': GenerationProfile('compare_row', num_predict=256),
+    'compare_verdict': GenerationProfile('compare_verdict', num_predict=384),
+}
+
+
+def get_profile(name: str, scale: int = 1) -> GenerationProfile:
+    """
+    Get the generation profile of a command.
+
+    Args:
+        name: Profile name
+        scale: Multiplier for the token cap, e.g. the number of ideas requested
+    """
+    profile = PROFILES[name]
+    override = os.getenv(f'FIBER_NUM_PREDICT_{name.upper()}')
+    num_predict = int(override) if override else profile.num_predict * max(1, scale)
+    return GenerationProfile(profile.name, num_predict, profile.stop)
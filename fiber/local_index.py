@@ -0,0 +1,188 @@
+"""Local full-text index of everything Fiber fetches or creates.
+
+Articles, notes, documents and comparisons are added to an inverted index
+stored in SQLite under ~/.fiber, so `fiber search --local` can rank them
+offline with BM25.
+"""
+
+import math
+import re
+import sqlite3
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+INDEX_FILE = Path.home() / '.fiber' / 'index' / 'fulltext.db'
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+SNIPPET_LENGTH = 200
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has',
+    'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to',
+    'was', 'were', 'will', 'with'
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    kind TEXT NOT NULL,
+    title TEXT,
+    content TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+"""
+
+
+@dataclass
+class LocalResult:
+    key: str
+    kind: str
+    title: str
+    snippet: str
+    score: float
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase index terms."""
+    return [
+        term for term in re.findall(r'[a-z0-9]+', text.lower())
+        if len(term) > 1 and term not in STOPWORDS
+    ]
+
+
+def _connect(index_file: Path = None) -> sqlite3.Connection:
+    """Open the index database, creating it if needed."""
+    index_file = index_file or INDEX_FILE
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(index_file), timeout=10)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def add_document(key: str, kind: str, title: Optional[str], content: str,
+                 index_file: Path = None) -> bool:
+    """
+    Add or replace a document in the index.
+
+    Args:
+        key: Unique identifier such as a URL or file path
+        kind: Type of content (article, note, document, comparison)
+        title: Display title of the document
+        content: Full text to index
+        index_file: Override the index location
+
+    Returns:
+        bool: True if the document was indexed, False otherwise
+    """
+    terms = Counter(tokenize(f"{title or ''} {content}"))
+    if not terms:
+        return False
+
+    try:
+        conn = _connect(index_file)
+        try:
+            with conn:
+                row = conn.execute('SELECT id FROM documents WHERE key = ?', (key,)).fetchone()
+                if row:
+                    conn.execute('DELETE FROM postings WHERE doc_id = ?', (row[0],))
+                    conn.execute('DELETE FROM documents WHERE id = ?', (row[0],))
+                cursor = conn.execute(
+                    'INSERT INTO documents (key, kind, title, content, length, added_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, kind, title, content, sum(terms.values()), time.time())
+                )
+                doc_id = cursor.lastrowid
+                conn.executemany(
+                    'INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)',
+                    ((term, doc_id, tf) for term, tf in terms.items())
+                )
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error:
+        # Indexing is best effort and must never break the command that produced the content
+        return False
+
+
+def _make_snippet(content: str, terms: List[str]) -> str:
+    """Get a short excerpt of the content around the first matching term."""
+    lower = content.lower()
+    positions = [pos for pos in (lower.find(term) for term in terms) if pos >= 0]
+    start = max(0, min(positions) - SNIPPET_LENGTH // 4) if positions else 0
+    snippet = ' '.join(content[start:start + SNIPPET_LENGTH].split())
+    prefix = '...' if start > 0 else ''
+    suffix = '...' if start + SNIPPET_LENGTH < len(content) else ''
+    return f"{prefix}{snippet}{suffix}"
+
+
+def search_local(query: str, limit: int = 10, index_file: Path = None) -> List[LocalResult]:
+    """
+    Rank indexed documents against a query with BM25.
+
+    Args:
+        query: Free text query
+        limit: Maximum number of results
+        index_file: Override the index location
+
+    Returns:
+        List of results, best match first
+    """
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+
+    conn = _connect(index_file)
+    try:
+        total_docs, avg_length = conn.execute(
+            'SELECT COUNT(*), AVG(length) FROM documents'
+        ).fetchone()
+        if not total_docs:
+            return []
+
+        placeholders = ','.join('?' * len(terms))
+        rows = conn.execute(
+            f'SELECT p.term, p.doc_id, p.tf, d.length FROM postings p '
+            f'JOIN documents d ON d.id = p.doc_id WHERE p.term IN ({placeholders})',
+            terms
+        ).fetchall()
+
+        doc_freq = Counter(term for term, _, _, _ in rows)
+        scores = Counter()
+        for term, doc_id, tf, length in rows:
+            df = doc_freq[term]
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            norm = K1 * (1 - B + B * length / avg_length)
+            scores[doc_id] += idf * tf * (K1 + 1) / (tf + norm)
+
+        results = []
+        for doc_id, score in scores.most_common(limit):
+            key, kind, title, content = conn.execute(
+                'SELECT key, kind, title, content FROM documents WHERE id = ?', (doc_id,)
+            ).fetchone()
+            results.append(LocalResult(
+                key=key,
+                kind=kind,
+                title=title or key,
+                snippet=_make_snippet(content, terms),
+                score=score
+            ))
+        return results
+    finally:
+        conn.close()
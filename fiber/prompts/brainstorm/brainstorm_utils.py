@@ -1,14 +1,44 @@
 """Brainstorming utilities for Fiber."""
 
 import os
+import random
+import re
+import threading
 import requests
-import json
-from rich.console import Console
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from rich.console import Console, Group
+from rich.live import Live
+from rich.spinner import Spinner
+from rich.text import Text
+from typing import List, Optional
 import time
 
+from fiber.generation_profiles import get_profile
+from fiber.structured_output import generate_json
+
 console = Console()
 
+# Independent generations per brainstorm; Ollama runs them in parallel up to OLLAMA_NUM_PARALLEL
+BRAINSTORM_SAMPLES = int(os.getenv('FIBER_BRAINSTORM_SAMPLES', '4'))
+
+# Sampling temperatures, cycled across the generations for diversity
+SAMPLE_TEMPERATURES = [0.7, 0.9, 1.1, 1.3]
+
+# Seconds allowed per generation; a single-slot Ollama queues the samples,
+# so the request timeout grows with the number of samples
+SAMPLE_TIMEOUT = int(os.getenv('FIBER_BRAINSTORM_TIMEOUT', '30'))
+
+# Model used to embed ideas for near-duplicate detection
+EMBED_MODEL = os.getenv('OLLAMA_EMBED_MODEL', 'nomic-embed-text')
+
+# Ideas at least this similar are treated as the same idea
+EMBEDDING_SIMILARITY = float(os.getenv('FIBER_IDEA_SIMILARITY', '0.9'))
+TITLE_SIMILARITY = 0.8
+
+TITLE_STOPWORDS = {'a', 'an', 'and', 'the', 'of', 'for', 'to', 'in', 'on', 'with', 'your', 'my'}
+
 def check_ollama_status():
     """Check if Ollama is running and responsive."""
     try:
@@ -17,8 +47,183 @@ def check_ollama_status():
     except:
         return False
 
-def generate_ideas(topic: str, category: str = "general") -> List[Dict[str, str]]:
-    """Generate creative ideas based on a topic and category."""
+@dataclass
+class Idea:
+    title: str
+    description: str
+
+IDEAS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "ideas": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "description": {"type": "string"}
+                },
+                "required": ["title", "description"]
+            }
+        }
+    },
+    "required": ["ideas"]
+}
+
+def ideas_from_json(data) -> List[Idea]:
+    """Build ideas from a decoded response, skipping entries without a title."""
+    entries = data.get('ideas') if isinstance(data, dict) else None
+    ideas = []
+    for entry in entries or []:
+        if isinstance(entry, dict) and str(entry.get('title') or '').strip():
+            ideas.append(Idea(
+                title=str(entry['title']).strip(),
+                description=str(entry.get('description') or '').strip()
+            ))
+    return ideas
+
+def complete_ideas(partial) -> List[Idea]:
+    """Get the ideas of a streaming response whose description has been fully written."""
+    entries = partial.get('ideas') if isinstance(partial, dict) else None
+    finished = [entry for entry in entries or [] if isinstance(entry, dict) and 'description' in entry]
+    return ideas_from_json({'ideas': finished})
+
+def normalize_title(title: str) -> str:
+    """Get the comparison key of an idea title."""
+    words = re.findall(r'[a-z0-9]+', title.lower())
+    return ' '.join(word for word in words if word not in TITLE_STOPWORDS)
+
+def embed_texts(texts: List[str]) -> Optional[List[List[float]]]:
+    """Embed texts with Ollama in one request, or None if no embedding model is available."""
+    try:
+        response = requests.post(
+            "http://localhost:11434/api/embed",
+            json={"model": EMBED_MODEL, "input": texts},
+            timeout=30
+        )
+        embeddings = response.json().get('embeddings') if response.status_code == 200 else None
+    except (requests.RequestException, ValueError):
+        embeddings = None
+    if not embeddings or len(embeddings) != len(texts):
+        return None
+    return embeddings
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    """Get the cosine similarity of two vectors."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = (sum(x * x for x in a) ** 0.5) * (sum(y * y for y in b) ** 0.5)
+    return dot / norm if norm else 0.0
+
+@dataclass
+class PooledIdea:
+    idea: Idea
+    key: str
+    # Number of generations that came up with this idea
+    support: int = 1
+    # Best position the idea had within a generation; models list their strongest ideas first
+    position: int = 0
+
+    @property
+    def score(self) -> float:
+        return self.support + 1 / (1 + self.position)
+
+class IdeaPool:
+    """
+    Collect ideas from concurrent generations, merging near-duplicates.
+    
+    While the generations stream, ideas are merged by title only, so adding
+    an idea never waits on the network. Ideas worded differently are merged
+    afterwards by `merge_similar`, which embeds them all in one request.
+    """
+    
+    def __init__(self):
+        self.ideas: List[PooledIdea] = []
+        self._lock = threading.Lock()
+    
+    def _find_duplicate(self, key: str) -> Optional[PooledIdea]:
+        for pooled in self.ideas:
+            if key == pooled.key or SequenceMatcher(None, key, pooled.key).ratio() >= TITLE_SIMILARITY:
+                return pooled
+        return None
+    
+    @staticmethod
+    def _merge(target: PooledIdea, idea: Idea, support: int, position: int):
+        target.support += support
+        target.position = min(target.position, position)
+        # Keep the more detailed wording
+        if len(idea.description) > len(target.idea.description):
+            target.idea = idea
+    
+    def add(self, idea: Idea, position: int) -> bool:
+        """
+        Add an idea from a generation.
+        
+        Returns:
+            True if it was new, False if it merged into a near-duplicate
+        """
+        key = normalize_title(idea.title)
+        with self._lock:
+            duplicate = self._find_duplicate(key)
+            if duplicate:
+                self._merge(duplicate, idea, 1, position)
+                return False
+            self.ideas.append(PooledIdea(idea, key, position=position))
+            return True
+    
+    def merge_similar(self):
+        """Merge ideas whose embeddings are near-identical, once the generations are done."""
+        with self._lock:
+            pooled = sorted(self.ideas, key=lambda p: p.score, reverse=True)
+        if len(pooled) < 2:
+            return
+        # Usually the embedding model is not pulled; the title merging then stands
+        embeddings = embed_texts([f"{p.idea.title}: {p.idea.description}" for p in pooled])
+        if not embeddings:
+            return
+        
+        kept = []
+        for candidate, embedding in zip(pooled, embeddings):
+            for target, target_embedding in kept:
+                if cosine_similarity(embedding, target_embedding) >= EMBEDDING_SIMILARITY:
+                    self._merge(target, candidate.idea, candidate.support, candidate.position)
+                    break
+            else:
+                kept.append((candidate, embedding))
+        with self._lock:
+            self.ideas = [target for target, _ in kept]
+    
+    def ranked(self, count: int) -> List[Idea]:
+        """Get the best distinct ideas so far."""
+        with self._lock:
+            pooled = sorted(self.ideas, key=lambda p: p.score, reverse=True)
+        return [p.idea for p in pooled[:count]]
+
+def render_ideas(ideas: List[Idea], message: Optional[str] = None):
+    """Render a ranked idea list for a live display."""
+    lines = Text()
+    for i, idea in enumerate(ideas, 1):
+        lines.append(f"{i}. {idea.title}\n", style="bold cyan")
+        if idea.description:
+            lines.append(f"   {idea.description}\n")
+    if not message:
+        return lines
+    return Group(lines, Spinner("dots", text=f"[bold blue]{message}"))
+
+def generate_ideas(topic: str, category: str = "general", count: int = 3,
+                   samples: int = BRAINSTORM_SAMPLES, live: bool = False) -> List[Idea]:
+    """Generate creative ideas based on a topic and category.
+    
+    Several generations run concurrently with different seeds and
+    temperatures. Their ideas are merged as they stream in, dropping
+    near-duplicates, and ranked by how many generations proposed them.
+    
+    Args:
+        topic: What to brainstorm about
+        category: project, assignment, writing or general
+        count: Number of ideas to return
+        samples: Number of concurrent generations
+        live: Show the ranked ideas updating while they stream in
+    """
     
     # Check if Ollama is running
     if not check_ollama_status():
@@ -31,84 +236,93 @@ def generate_ideas(topic: str, category: str = "general") -> List[Dict[str, str]
         
         # Craft prompt based on category
         prompts = {
-            "project": """Generate 3 unique project ideas related to: {topic}
+            "project": """Generate {count} unique project ideas related to: {topic}
             For each idea include:
             - A catchy title
             - A one-line description
             Focus on practical, engaging projects that can be completed in 1-4 weeks.""",
             
-            "assignment": """Generate 3 interesting assignment ideas related to: {topic}
+            "assignment": """Generate {count} interesting assignment ideas related to: {topic}
             For each idea include:
             - A clear title
             - A one-line description
             Focus on educational value and skill development.""",
             
-            "writing": """Generate 3 creative writing prompts related to: {topic}
+            "writing": """Generate {count} creative writing prompts related to: {topic}
             For each idea include:
             - An engaging title
-            - A one-line story hook
+            - A one-line story hook as the description
             Focus on unique angles and interesting scenarios.""",
             
-            "general": """Generate 3 creative ideas related to: {topic}
+            "general": """Generate {count} creative ideas related to: {topic}
             For each idea include:
             - A clear title
             - A one-line description
             Focus on variety and originality."""
         }
         
-        prompt = prompts.get(category, prompts["general"]).format(topic=topic)
+        prompt = prompts.get(category, prompts["general"]).format(topic=topic, count=count)
+        prompt += '\nRespond in JSON with an "ideas" list of objects with "title" and "description".'
         
-        # Use streaming response
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": True
-            },
-            stream=True,
-            timeout=10
-        )
+        pool = IdeaPool()
+        samples = max(1, samples)
+        profile = get_profile('brainstorm_idea', scale=count)
         
-        if response.status_code == 200:
-            # Collect the streamed response
-            content = ""
-            with console.status("[bold blue]Generating ideas...", spinner="dots") as status:
-                for line in response.iter_lines():
-                    if line:
-                        try:
-                            json_response = json.loads(line)
-                            if "response" in json_response:
-                                content += json_response["response"]
-                                # Show progress
-                                if json_response["response"].strip():
-                                    status.update(f"[bold blue]Generating ideas... {content.count('.')}[/bold blue]")
-                        except json.JSONDecodeError:
-                            continue
-            
-            # Parse the response into structured ideas
-            ideas = []
-            current_idea = {}
+        if live:
+            display = Live(render_ideas([], "Generating ideas..."), console=console,
+                           refresh_per_second=8, transient=True)
+        else:
+            display = console.status("[bold blue]Generating ideas...", spinner="dots")
+        
+        def show_progress():
+            ideas = pool.ranked(count)
+            message = f"Generating ideas... {len(pool.ideas)} distinct so far"
+            if live:
+                display.update(render_ideas(ideas, message))
+            else:
+                display.update(f"[bold blue]{message}[/bold blue]")
+        
+        def run_sample(index: int):
+            options = {
+                "temperature": SAMPLE_TEMPERATURES[index % len(SAMPLE_TEMPERATURES)],
+                "seed": random.randrange(2 ** 31)
+            }
+            added = 0
             
-            for line in content.split('\n'):
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                # Check if line starts with number (1-3)
-                if line[0].isdigit() and line[1] in [')', '.', ':']:
-                    # Save previous idea if exists
-                    if current_idea:
-                        ideas.append(current_idea)
-                    current_idea = {"title": line[2:].strip()}
-                elif current_idea and "title" in current_idea and "description" not in current_idea:
-                    current_idea["description"] = line.strip()
+            def add_ideas(ideas: List[Idea]):
+                nonlocal added
+                for position, idea in enumerate(ideas[added:], start=added):
+                    pool.add(idea, position)
+                added = max(added, len(ideas))
+                show_progress()
             
-            # Add last idea
-            if current_idea:
-                ideas.append(current_idea)
+            def on_update(partial):
+                complete = complete_ideas(partial)
+                if len(complete) > added:
+                    add_ideas(complete)
             
-            return ideas[:3]  # Ensure we only return 3 ideas
+            # Stop the generation as soon as the requested number of ideas is complete
+            add_ideas(ideas_from_json(generate_json(
+                prompt, model, IDEAS_SCHEMA, profile.options(options), on_update=on_update,
+                timeout=SAMPLE_TIMEOUT * samples,
+                is_complete=lambda partial: len(complete_ideas(partial)) >= count
+            ))[:count])
+        
+        with display:
+            with ThreadPoolExecutor(max_workers=samples) as executor:
+                futures = [executor.submit(run_sample, i) for i in range(samples)]
+                errors = []
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        errors.append(e)
+        
+        # Report a failure only if no generation produced anything
+        if errors and not pool.ideas:
+            raise errors[0]
+        pool.merge_similar()
+        return pool.ranked(count)
             
     except requests.Timeout:
         console.print("[red]Error: Request timed out.[/red]")
@@ -121,7 +335,7 @@ def generate_ideas(topic: str, category: str = "general") -> List[Dict[str, str]
     
     return []
 
-def display_ideas(ideas: List[Dict[str, str]], topic: str, category: str):
+def display_ideas(ideas: List[Idea], topic: str, category: str):
     """Display generated ideas in a clean format."""
     if not ideas:
         return  # Error messages already handled in generate_ideas
@@ -138,9 +352,6 @@ def display_ideas(ideas: List[Dict[str, str]], topic: str, category: str):
     console.print(f"\n{emoji} [bold]Ideas for:[/bold] {topic}\n")
     
     for i, idea in enumerate(ideas, 1):
-        title = idea.get("title", "").strip()
-        desc = idea.get("description", "").strip()
-        
-        console.print(f"[bold cyan]{i}. {title}[/bold cyan]")
-        if desc:
-            console.print(f"   {desc}\n")
+        console.print(f"[bold cyan]{i}. {idea.title}[/bold cyan]")
+        if idea.description:
+            console.print(f"   {idea.description}\n")
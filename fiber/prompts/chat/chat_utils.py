@@ -9,6 +9,8 @@ from rich.console import Console
 from typing import Optional
 from requests.exceptions import Timeout, RequestException
 
+from fiber.token_budget import TokenBudget
+
 console = Console()
 
 # Configuration
@@ -39,11 +41,15 @@ def chat_with_ai(message: str) -> Optional[str]:
         print(f"Debug: Converting message from {type(message)} to str", file=sys.stderr)
         message = str(message)
         
-    # Prepare request data
+    # Prepare request data, keeping the message within the model's context
+    budget = TokenBudget(model)
+    prefix = 'You are a helpful AI assistant. Respond to: '
+    prompt = prefix + budget.fit(message, budget.available(prefix))
     data = {
         'model': model,
-        'prompt': f'You are a helpful AI assistant. Respond to: {message}',
-        'stream': True
+        'prompt': prompt,
+        'stream': True,
+        'options': budget.options(prompt)
     }
     print(f"Debug: Request data: {data}", file=sys.stderr)
     
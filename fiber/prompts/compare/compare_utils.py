@@ -1,21 +1,40 @@
 """Comparison utilities for Fiber."""
 
-from dataclasses import dataclass
-from typing import List, Dict, Tuple
+from dataclasses import asdict, dataclass
+from typing import List, Dict, Optional, Tuple
 import requests
-from rich.console import Console
+from rich.console import Console, Group
+from rich.live import Live
+from rich.spinner import Spinner
+from rich.text import Text
 from rich.table import Table
 from rich.panel import Panel
 from rich.markdown import Markdown
 import os
-import json
 from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont
 import textwrap
 from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+from fiber.generation_profiles import GenerationProfile, get_profile
+from fiber.prompts.compare.comparison_cache import canonical_item, load_comparison, store_comparison
+from fiber.prompts.compare.fonts import get_font
+from fiber.prompts.compare.vector_utils import VECTOR_RENDERERS, save_comparison_vector
+from fiber.structured_output import OllamaError, TruncatedGeneration, generate_json
+from fiber.token_budget import TokenBudget
 
 console = Console()
 
+# Part of the comparison cache key; bump when the prompts or schemas change
+COMPARISON_PROMPT_VERSION = 2
+
+# From this many items the comparison is generated one aspect at a time
+FANOUT_MIN_ITEMS = int(os.getenv('FIBER_COMPARE_FANOUT', '4'))
+# Aspect rows generated concurrently; Ollama serves them in parallel up to OLLAMA_NUM_PARALLEL
+FANOUT_WORKERS = int(os.getenv('FIBER_COMPARE_WORKERS', '4'))
+FANOUT_ASPECTS = 6
+
 # Constants for image generation
 COLORS = {
     'background': (255, 255, 255),
@@ -26,6 +45,68 @@ COLORS = {
     'highlight': (70, 130, 180)
 }
 
+class TextMeasurer:
+    """Measure and wrap text for one font, measuring each distinct word once."""
+    
+    def __init__(self, font: ImageFont.FreeTypeFont):
+        self.font = font
+        self.widths: Dict[str, int] = {}
+        self.space_width = self.width(' ')
+    
+    def width(self, text: str) -> int:
+        """Get the advance width of a piece of text, using the cache."""
+        cached = self.widths.get(text)
+        if cached is None:
+            if hasattr(self.font, 'getlength'):
+                cached = int(round(self.font.getlength(text)))
+            else:
+                bbox = self.font.getbbox(text)
+                cached = bbox[2] - bbox[0] if bbox else 0
+            self.widths[text] = cached
+        return cached
+    
+    def wrap(self, text: str, max_width: int) -> List[str]:
+        """Wrap text to fit within a given width in a single pass over its words."""
+        lines = []
+        current_line = []
+        current_width = 0
+        
+        for word in text.split():
+            word_width = self.width(word)
+            if not current_line:
+                current_line = [word]
+                current_width = word_width
+            elif current_width + self.space_width + word_width <= max_width:
+                current_line.append(word)
+                current_width += self.space_width + word_width
+            else:
+                lines.append(' '.join(current_line))
+                current_line = [word]
+                current_width = word_width
+        
+        if current_line:
+            lines.append(' '.join(current_line))
+            
+        return lines
+
+# Word width caches shared by every generator, keyed by font
+_measurers: Dict[int, TextMeasurer] = {}
+
+def get_measurer(font: ImageFont.FreeTypeFont) -> TextMeasurer:
+    """Get the shared measurer for a font."""
+    measurer = _measurers.get(id(font))
+    if measurer is None or measurer.font is not font:
+        measurer = _measurers[id(font)] = TextMeasurer(font)
+    return measurer
+
+@dataclass
+class TextRun:
+    x: int
+    y: int
+    text: str
+    font: ImageFont.FreeTypeFont
+    fill: Tuple[int, int, int]
+
 class ImageGenerator:
     def __init__(self, width=1200, padding=20, line_height=30):
         self.width = width
@@ -33,211 +114,96 @@ class ImageGenerator:
         self.line_height = line_height
         self.current_y = padding
         
-        # Try to load Arial font, fall back to default if not available
-        try:
-            self.title_font = ImageFont.truetype("arial.ttf", 36)
-            self.header_font = ImageFont.truetype("arial.ttf", 24)
-            self.text_font = ImageFont.truetype("arial.ttf", 20)
-        except OSError:
-            # Fallback to default font
-            self.title_font = ImageFont.load_default()
-            self.header_font = ImageFont.load_default()
-            self.text_font = ImageFont.load_default()
+        # Fonts are discovered once per process and shared between generators
+        self.title_font = get_font(36)
+        self.header_font = get_font(24)
+        self.text_font = get_font(20)
+    
+    def measurer(self, font: ImageFont.FreeTypeFont) -> TextMeasurer:
+        """Get the shared measurer for a font."""
+        return get_measurer(font)
     
     def calculate_text_width(self, text: str, font: ImageFont.FreeTypeFont) -> int:
-        """Calculate width of text using the newer getbbox method."""
-        bbox = font.getbbox(text)
-        return bbox[2] - bbox[0] if bbox else 0
+        """Calculate width of text using the measurement cache."""
+        return self.measurer(font).width(text)
     
     def calculate_text_height(self, text: str, font: ImageFont.FreeTypeFont, max_width: int) -> int:
         """Calculate the height needed for wrapped text."""
-        words = text.split()
-        lines = []
-        current_line = []
-        
-        for word in words:
-            current_line.append(word)
-            line = ' '.join(current_line)
-            w = self.calculate_text_width(line, font)
-            if w > max_width:
-                if len(current_line) == 1:
-                    lines.append(line)
-                    current_line = []
-                else:
-                    current_line.pop()
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-        
-        if current_line:
-            lines.append(' '.join(current_line))
-            
-        return len(lines) * self.line_height
+        return len(self.wrap_text(text, font, max_width)) * self.line_height
     
     def wrap_text(self, text: str, font: ImageFont.FreeTypeFont, max_width: int) -> List[str]:
         """Wrap text to fit within a given width."""
-        words = text.split()
-        lines = []
-        current_line = []
-        
-        for word in words:
-            current_line.append(word)
-            line = ' '.join(current_line)
-            w = self.calculate_text_width(line, font)
-            if w > max_width:
-                if len(current_line) == 1:
-                    lines.append(line)
-                    current_line = []
-                else:
-                    current_line.pop()
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-        
-        if current_line:
-            lines.append(' '.join(current_line))
-            
-        return lines
+        return self.measurer(font).wrap(text, max_width)
     
-    def generate_comparison_image(self, result: 'ComparisonResult') -> Image.Image:
-        """Generate an image for the comparison result."""
-        # Calculate total height needed
-        height = self.padding  # Start with top padding
-        
-        # Title space
-        height += self.line_height * 2
+    def layout_comparison(self, result: 'ComparisonResult') -> Tuple[int, List[TextRun]]:
+        """
+        Compute every line of text and its position in a single pass.
         
-        # Space for each comparison point
+        Returns:
+            Tuple of (image height, text runs to draw)
+        """
+        runs = []
+        y = self.padding
         content_width = self.width - (2 * self.padding)
-        for point in result.points:
-            height += self.line_height  # Aspect header
-            max_desc_height = 0
-            for desc in point.descriptions:
-                desc_height = self.calculate_text_height(desc, self.text_font, content_width // len(result.items))
-                max_desc_height = max(max_desc_height, desc_height)
-            height += max_desc_height + self.padding
-            
-            if point.similarities:
-                height += self.calculate_text_height(f"Similarities: {point.similarities}", 
-                                                   self.text_font, content_width) + self.padding
-            if point.differences:
-                height += self.calculate_text_height(f"Differences: {point.differences}", 
-                                                   self.text_font, content_width) + self.padding
-        
-        # Space for summary and recommendation
-        if result.summary != 'No summary available':
-            height += self.line_height
-            height += self.calculate_text_height(result.summary, self.text_font, content_width) + self.padding
-        
-        if result.recommendation != 'No recommendation available':
-            height += self.line_height
-            height += self.calculate_text_height(result.recommendation, self.text_font, content_width)
-        
-        height += self.padding  # Bottom padding
-        
-        # Create the image
-        img = Image.new('RGB', (self.width, height), COLORS['background'])
-        draw = ImageDraw.Draw(img)
         
-        # Reset current_y
-        self.current_y = self.padding
+        def add_block(text: str, font, fill, x: int, max_width: int) -> int:
+            """Lay out wrapped text starting at y and return its height."""
+            lines = self.wrap_text(text, font, max_width)
+            for i, line in enumerate(lines):
+                runs.append(TextRun(x, y + i * self.line_height, line, font, fill))
+            return len(lines) * self.line_height
         
-        # Draw title
+        # Title
         title = f"Comparison of {' vs '.join(result.items)}"
-        draw.text((self.padding, self.current_y), title, 
-                 font=self.title_font, fill=COLORS['title'])
-        self.current_y += self.line_height * 2
+        runs.append(TextRun(self.padding, y, title, self.title_font, COLORS['title']))
+        y += self.line_height * 2
         
-        # Draw comparison points
+        # Comparison points
+        col_width = (content_width - self.padding) // max(1, len(result.items))
         for point in result.points:
-            # Draw aspect header
-            draw.text((self.padding, self.current_y), point.aspect, 
-                     font=self.header_font, fill=COLORS['header'])
-            self.current_y += self.line_height
+            runs.append(TextRun(self.padding, y, point.aspect, self.header_font, COLORS['header']))
+            y += self.line_height
             
-            # Draw descriptions
-            start_y = self.current_y
+            # Descriptions side by side; the row is as tall as the longest column
             max_height = 0
-            col_width = (content_width - self.padding) // len(result.items)
-            
             for i, desc in enumerate(point.descriptions):
                 x = self.padding + (i * col_width)
-                wrapped_lines = self.wrap_text(desc, self.text_font, col_width - self.padding)
-                
-                for line in wrapped_lines:
-                    draw.text((x, self.current_y), line, 
-                             font=self.text_font, fill=COLORS['text'])
-                    self.current_y += self.line_height
-                
-                max_height = max(max_height, len(wrapped_lines) * self.line_height)
-                self.current_y = start_y  # Reset for next column
-            
-            self.current_y = start_y + max_height + self.padding
+                max_height = max(max_height, add_block(desc, self.text_font, COLORS['text'], x, col_width - self.padding))
+            y += max_height + self.padding
             
-            # Draw similarities and differences
             if point.similarities:
-                wrapped_lines = self.wrap_text(f"Similarities: {point.similarities}", 
-                                             self.text_font, content_width)
-                for line in wrapped_lines:
-                    draw.text((self.padding, self.current_y), line, 
-                             font=self.text_font, fill=COLORS['highlight'])
-                    self.current_y += self.line_height
-                self.current_y += self.padding
-            
+                y += add_block(f"Similarities: {point.similarities}", self.text_font,
+                               COLORS['highlight'], self.padding, content_width) + self.padding
             if point.differences:
-                wrapped_lines = self.wrap_text(f"Differences: {point.differences}", 
-                                             self.text_font, content_width)
-                for line in wrapped_lines:
-                    draw.text((self.padding, self.current_y), line, 
-                             font=self.text_font, fill=COLORS['highlight'])
-                    self.current_y += self.line_height
-                self.current_y += self.padding
+                y += add_block(f"Differences: {point.differences}", self.text_font,
+                               COLORS['highlight'], self.padding, content_width) + self.padding
         
-        # Draw summary and recommendation
+        # Summary and recommendation
         if result.summary != 'No summary available':
-            draw.text((self.padding, self.current_y), "Summary:", 
-                     font=self.header_font, fill=COLORS['header'])
-            self.current_y += self.line_height
-            
-            wrapped_lines = self.wrap_text(result.summary, self.text_font, content_width)
-            for line in wrapped_lines:
-                draw.text((self.padding, self.current_y), line, 
-                         font=self.text_font, fill=COLORS['text'])
-                self.current_y += self.line_height
-            self.current_y += self.padding
+            runs.append(TextRun(self.padding, y, "Summary:", self.header_font, COLORS['header']))
+            y += self.line_height
+            y += add_block(result.summary, self.text_font, COLORS['text'], self.padding, content_width) + self.padding
         
         if result.recommendation != 'No recommendation available':
-            draw.text((self.padding, self.current_y), "Recommendation:", 
-                     font=self.header_font, fill=COLORS['header'])
-            self.current_y += self.line_height
-            
-            wrapped_lines = self.wrap_text(result.recommendation, self.text_font, content_width)
-            for line in wrapped_lines:
-                draw.text((self.padding, self.current_y), line, 
-                         font=self.text_font, fill=COLORS['text'])
-                self.current_y += self.line_height
+            runs.append(TextRun(self.padding, y, "Recommendation:", self.header_font, COLORS['header']))
+            y += self.line_height
+            y += add_block(result.recommendation, self.text_font, COLORS['text'], self.padding, content_width)
         
-        return img
-
-def save_comparison_image(result: 'ComparisonResult', base_path: str = None) -> str:
-    """Generate and save an image of the comparison."""
-    if base_path is None:
-        base_path = os.getenv('DEFAULT_PATH', 'D:/Fiber_Notes')
-    
-    # Create comparison directory if it doesn't exist
-    comparison_dir = Path(base_path) / 'comparisons'
-    comparison_dir.mkdir(parents=True, exist_ok=True)
+        return y + self.padding, runs
     
-    # Generate filename
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    items_text = '_vs_'.join(item.replace(' ', '_') for item in result.items)
-    filename = f"comparison_{items_text}_{timestamp}.png"
-    filepath = comparison_dir / filename
-    
-    # Generate and save image
-    generator = ImageGenerator()
-    img = generator.generate_comparison_image(result)
-    img.save(filepath)
-    
-    return str(filepath)
+    def generate_comparison_image(self, result: 'ComparisonResult') -> Image.Image:
+        """Generate an image for the comparison result."""
+        height, runs = self.layout_comparison(result)
+        
+        # Create the image
+        img = Image.new('RGB', (self.width, height), COLORS['background'])
+        draw = ImageDraw.Draw(img)
+        
+        for run in runs:
+            draw.text((run.x, run.y), run.text, font=run.font, fill=run.fill)
+        
+        self.current_y = height - self.padding
+        return img
 
 @dataclass
 class ComparisonPoint:
@@ -252,102 +218,271 @@ class ComparisonResult:
     points: List[ComparisonPoint]
     summary: str
     recommendation: str
+    # False when rows were skipped, the verdict failed or the output was cut off
+    complete: bool = True
 
 def create_comparison_prompt(items: List[str]) -> str:
     """Create a detailed prompt for comparison."""
     return f"""Compare the following items in detail: {', '.join(items)}
 
-For each important aspect, provide:
+For each of the {FANOUT_ASPECTS} most important aspects, provide:
 1. A clear description for each item
 2. Key similarities
 3. Notable differences
 
-Also include:
-- A balanced analysis of strengths and weaknesses
-- Common misconceptions or important nuances
-- Practical implications or real-world applications
-- A final summary and recommendation
+Cover strengths and weaknesses, common misconceptions or important nuances,
+and practical implications or real-world applications.
+
+Respond in JSON with an "aspects" list, where every aspect has an "aspect" name,
+"descriptions" keyed by item name, "similarities" and "differences", followed by
+a final "summary" and "recommendation"."""
+
+def item_fields_schema(items: List[str]) -> Dict:
+    """Get a schema for an object with one string field per item."""
+    return {
+        "type": "object",
+        "properties": {item: {"type": "string"} for item in items},
+        "required": list(items)
+    }
+
+def point_schema(items: List[str]) -> Dict:
+    """Get the JSON schema of one comparison aspect."""
+    return {
+        "type": "object",
+        "properties": {
+            "aspect": {"type": "string"},
+            "descriptions": item_fields_schema(items),
+            "similarities": {"type": "string"},
+            "differences": {"type": "string"}
+        },
+        "required": ["aspect", "descriptions", "similarities", "differences"]
+    }
+
+VERDICT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "recommendation": {"type": "string"}
+    },
+    "required": ["summary", "recommendation"]
+}
+
+def comparison_schema(items: List[str]) -> Dict:
+    """Get the JSON schema of a full comparison."""
+    return {
+        "type": "object",
+        "properties": {
+            "aspects": {"type": "array", "items": point_schema(items)},
+            **VERDICT_SCHEMA["properties"]
+        },
+        "required": ["aspects", *VERDICT_SCHEMA["required"]]
+    }
+
+def _text(value) -> str:
+    """Get a JSON value as display text."""
+    if isinstance(value, list):
+        return '; '.join(_text(v) for v in value)
+    return str(value).strip() if value is not None else ''
 
-Format your response as a structured comparison with clear sections."""
+def point_from_json(items: List[str], data: Dict) -> Optional[ComparisonPoint]:
+    """Build a ComparisonPoint from a decoded aspect, or None if it has no content."""
+    if not isinstance(data, dict) or not _text(data.get('aspect')):
+        return None
+    
+    descriptions = data.get('descriptions') or {}
+    if isinstance(descriptions, list):
+        descriptions = dict(zip(items, descriptions))
+    by_item = {str(key).strip().lower(): _text(value) for key, value in descriptions.items()}
+    
+    return ComparisonPoint(
+        aspect=_text(data['aspect']),
+        descriptions=[by_item.get(item.lower(), '') for item in items],
+        similarities=_text(data.get('similarities')),
+        differences=_text(data.get('differences'))
+    )
+
+def has_verdict(data: Optional[Dict]) -> bool:
+    """Check that a decoded response has both a summary and a recommendation."""
+    return (isinstance(data, dict) and bool(_text(data.get('summary')))
+            and bool(_text(data.get('recommendation'))))
 
-def get_comparison(items: List[str]) -> ComparisonResult:
-    """Get a detailed comparison using Ollama."""
+def comparison_from_json(items: List[str], data: Optional[Dict]) -> ComparisonResult:
+    """Build a ComparisonResult from a decoded comparison."""
+    data = data if isinstance(data, dict) else {}
+    points = [point_from_json(items, aspect) for aspect in data.get('aspects') or []]
+    return ComparisonResult(
+        items=items,
+        points=[point for point in points if point],
+        summary=_text(data.get('summary')) or 'No summary available',
+        recommendation=_text(data.get('recommendation')) or 'No recommendation available'
+    )
+
+class IncrementalComparisonParser:
+    """Emit ComparisonPoints from a streaming comparison as soon as each aspect is complete."""
+    
+    def __init__(self, items: List[str]):
+        self.items = items
+        self.points: List[ComparisonPoint] = []
+        self._consumed = 0
+    
+    def feed(self, partial) -> List[ComparisonPoint]:
+        """
+        Take the latest partially parsed response.
+        
+        Returns:
+            The points completed since the previous call
+        """
+        if not isinstance(partial, dict):
+            return []
+        aspects = partial.get('aspects') or []
+        # The last aspect may still be streaming until a field after the list appears
+        complete = len(aspects) if any(key != 'aspects' for key in partial) else len(aspects) - 1
+        
+        new_points = []
+        for data in aspects[self._consumed:complete]:
+            point = point_from_json(self.items, data)
+            if point:
+                new_points.append(point)
+        self._consumed = max(self._consumed, complete)
+        self.points.extend(new_points)
+        return new_points
+
+class ComparisonProgress:
+    """Show comparison progress as a spinner, or as a live table that grows row by row."""
+    
+    def __init__(self, items: List[str], live: bool = False):
+        self.items = items
+        self.live = live
+        self.message = "Generating comparison..."
+        self.points: List[ComparisonPoint] = []
+        self._display = None
+    
+    def _render(self):
+        table = build_comparison_table(self.items, self.points)
+        if not self.message:
+            return table
+        return Group(table, Spinner("dots", text=f"[bold blue]{self.message}"))
+    
+    def __enter__(self):
+        if self.live:
+            self._display = Live(self._render(), console=console, refresh_per_second=8)
+        else:
+            self._display = console.status(f"[bold blue]{self.message}")
+        self._display.__enter__()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if self.live:
+            # Leave only the finished table on screen
+            self.message = None
+            self._display.update(self._render() if self.points and not exc_type else Text(""))
+        return self._display.__exit__(exc_type, exc, tb)
+    
+    def update(self, message: str):
+        """Change the progress message."""
+        self.message = message
+        if self.live:
+            self._display.update(self._render())
+        else:
+            self._display.update(f"[bold blue]{message}")
+    
+    def show(self, points: List[ComparisonPoint], message: str):
+        """Show the rows completed so far."""
+        self.points = list(points)
+        self.update(message)
+
+def project_comparison(data: Dict, items: List[str]) -> Optional[ComparisonResult]:
+    """Rebuild a cached comparison with its columns in the requested item order."""
+    stored = [canonical_item(item) for item in data.get('items') or []]
     try:
-        # Get model from environment or use default
-        model = os.getenv('OLLAMA_MODEL', 'qwen:7b')
+        order = [stored.index(canonical_item(item)) for item in items]
+    except ValueError:
+        return None
+    
+    points = []
+    for point in data.get('points') or []:
+        descriptions = point.get('descriptions') or []
+        points.append(ComparisonPoint(
+            aspect=point.get('aspect', ''),
+            descriptions=[descriptions[i] if i < len(descriptions) else '' for i in order],
+            similarities=point.get('similarities', ''),
+            differences=point.get('differences', '')
+        ))
+    if not points:
+        return None
+    
+    return ComparisonResult(
+        items=list(items),
+        points=points,
+        summary=data.get('summary') or 'No summary available',
+        recommendation=data.get('recommendation') or 'No recommendation available'
+    )
+
+def get_comparison(items: List[str], live: bool = False, use_cache: bool = True) -> ComparisonResult:
+    """Get a detailed comparison using Ollama.
+    
+    Comparisons of the same items in any order are served from the cache
+    without calling the model.
+    
+    Args:
+        items: The items to compare
+        live: Show the table growing row by row while the model streams
+        use_cache: Reuse a cached comparison of the same items
+    """
+    # Get model from environment or use default
+    model = os.getenv('OLLAMA_MODEL', 'qwen:7b')
+    
+    if use_cache:
+        cached = load_comparison(items, model, COMPARISON_PROMPT_VERSION)
+        result = project_comparison(cached, items) if cached else None
+        if result:
+            if live:
+                console.print(build_comparison_table(result.items, result.points))
+            console.print("[dim]Loaded from the comparison cache; use --refresh to regenerate.[/dim]")
+            return result
+    
+    result = generate_comparison(items, model, live)
+    if result.complete:
+        data = asdict(result)
+        del data['complete']
+        store_comparison(items, model, COMPARISON_PROMPT_VERSION, data)
+    else:
+        console.print("[yellow]The comparison is incomplete, so it was not cached.[/yellow]")
+    return result
+
+def generate_comparison(items: List[str], model: str, live: bool = False) -> ComparisonResult:
+    """Generate a comparison with the model."""
+    try:
+        if len(items) >= FANOUT_MIN_ITEMS:
+            return get_comparison_fanout(items, model, live)
         
-        # Create the request
-        with console.status("[bold blue]Connecting to Ollama...") as status:
-            response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": model,
-                    "prompt": create_comparison_prompt(items),
-                    "stream": True
-                },
-                stream=True,
-                timeout=60  # Increased timeout
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"Ollama API returned status code {response.status_code}")
-            
-            # Process streaming response
-            content = []
-            status.update("[bold blue]Generating comparison...")
+        prompt = create_comparison_prompt(items)
+        # Every item adds a description to each aspect row
+        profile = get_profile('compare', scale=len(items))
+        budget = TokenBudget(model, output_tokens=profile.num_predict)
+        parser = IncrementalComparisonParser(items)
+        
+        with ComparisonProgress(items, live) as progress:
+            def show_progress(partial):
+                if parser.feed(partial):
+                    progress.show(parser.points, f"{len(parser.points)} aspects so far, still generating...")
             
+            truncated = False
             try:
-                for line in response.iter_lines():
-                    if line:
-                        try:
-                            json_response = json.loads(line.decode())
-                            if 'response' in json_response:
-                                chunk = json_response['response']
-                                content.append(chunk)
-                                # Show some progress
-                                if len(chunk.strip()) > 0:
-                                    status.update(f"[bold blue]Analyzing: {chunk.strip()[:50]}...")
-                        except json.JSONDecodeError:
-                            continue
-            except requests.exceptions.ChunkedEncodingError:
-                # Handle streaming errors gracefully
-                if not content:
-                    raise Exception("Stream interrupted before receiving content")
-                # If we have some content, continue processing
-                console.print("[yellow]Note: Stream ended early but continuing with received content[/yellow]")
-            
-            if not content:
-                raise Exception("No response received from AI model")
-            
-            # Combine all content
-            full_content = "".join(content)
-            
-            # Process the content to extract structured information
-            status.update("[bold blue]Structuring comparison data...")
-            sections = parse_comparison_content(full_content)
-            
-            # Validate the parsed sections
-            if not sections['points']:
-                # If parsing failed, return raw format
-                console.print("[yellow]Note: Structured parsing failed, displaying raw comparison[/yellow]")
-                return ComparisonResult(
-                    items=items,
-                    points=[ComparisonPoint(
-                        aspect="Comparison",
-                        descriptions=[full_content],
-                        similarities="",
-                        differences=""
-                    )],
-                    summary="Raw comparison data",
-                    recommendation="Please see the main comparison text above"
-                )
-            
-            return ComparisonResult(
-                items=items,
-                points=sections['points'],
-                summary=sections.get('summary', 'No summary available'),
-                recommendation=sections.get('recommendation', 'No recommendation available')
-            )
+                data = generate_json(prompt, model, comparison_schema(items),
+                                     profile.options(budget.options(prompt)), on_update=show_progress)
+            except TruncatedGeneration as e:
+                # Keep the finished rows, but the summary and recommendation are likely missing
+                console.print(f"[yellow]Warning: {str(e)} ({profile.num_predict} tokens); "
+                              f"raise FIBER_NUM_PREDICT_COMPARE for a full comparison[/yellow]")
+                data, truncated = e.value, True
+            progress.show(comparison_from_json(items, data).points, "Comparison complete")
+        
+        result = comparison_from_json(items, data)
+        if not result.points:
+            raise Exception("No comparison received from AI model")
+        result.complete = not truncated and has_verdict(data)
+        return result
         
     except requests.exceptions.ConnectionError:
         raise Exception("Could not connect to Ollama. Make sure Ollama is running (https://ollama.ai)")
@@ -357,86 +492,142 @@ def get_comparison(items: List[str]) -> ComparisonResult:
         console.print(f"[yellow]Debug - Full error:[/yellow] {str(e)}")
         raise
 
-def parse_comparison_content(content: str) -> Dict:
-    """Parse the AI response into structured sections."""
-    # Split content into sections
-    lines = content.split('\n')
-    current_section = None
-    sections = {
-        'points': [],
-        'summary': '',
-        'recommendation': ''
-    }
-    
-    current_point = None
-    collecting_descriptions = False
+def create_aspects_prompt(items: List[str]) -> str:
+    """Create the prompt asking which aspects to compare."""
+    return f"""List the {FANOUT_ASPECTS} most important aspects for comparing: {', '.join(items)}
+
+Respond in JSON with an "aspects" list of short aspect names."""
+
+ASPECTS_SCHEMA = {
+    "type": "object",
+    "properties": {"aspects": {"type": "array", "items": {"type": "string"}}},
+    "required": ["aspects"]
+}
+
+def parse_aspects(data: Optional[Dict]) -> List[str]:
+    """Get the aspect names from a decoded aspect list, dropping duplicates."""
+    names = data.get('aspects') if isinstance(data, dict) else None
+    aspects, seen = [], set()
+    for name in names or []:
+        aspect = _text(name)
+        if aspect and aspect.lower() not in seen:
+            seen.add(aspect.lower())
+            aspects.append(aspect)
+    return aspects[:FANOUT_ASPECTS]
+
+def create_row_prompt(items: List[str], aspect: str) -> str:
+    """Create the prompt for a single aspect row."""
+    return f"""Compare {', '.join(items)} on this aspect only: {aspect}
+
+Respond in JSON with the "aspect" name, one or two sentences per item in
+"descriptions" keyed by item name, and one sentence each for "similarities"
+and "differences"."""
+
+def create_verdict_prompt(items: List[str], points: List[ComparisonPoint]) -> str:
+    """Create the prompt for the summary and recommendation of an assembled table."""
+    table = format_comparison_text(ComparisonResult(items, points, '', ''))
+    table = table.rsplit('\nSummary:', 1)[0]
+    return f"""{table}
+
+Based on the comparison above, respond in JSON with a "summary" of two or three
+sentences and a "recommendation" of which to choose and when."""
+
+# Errors that lose one generated part of a fanned-out comparison rather than all of it
+GENERATION_ERRORS = (requests.exceptions.RequestException, OllamaError, ValueError, TypeError, AttributeError)
+
+def _generate(prompt: str, model: str, schema: Dict, profile: GenerationProfile) -> Optional[Dict]:
+    """Generate a schema-constrained response sized for its prompt."""
+    budget = TokenBudget(model, output_tokens=profile.num_predict)
+    return generate_json(prompt, model, schema, profile.options(budget.options(prompt)), timeout=120)
+
+def get_comparison_fanout(items: List[str], model: str, live: bool = False) -> ComparisonResult:
+    """
+    Compare many items one aspect at a time.
     
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Detect section headers
-        lower_line = line.lower()
-        if 'summary' in lower_line and 'summary:' in lower_line:
-            current_section = 'summary'
-            sections['summary'] = line.split(':', 1)[1].strip()
-            continue
-        elif 'recommend' in lower_line and ':' in line:
-            current_section = 'recommendation'
-            sections['recommendation'] = line.split(':', 1)[1].strip()
-            continue
+    The aspect list is requested first, then every aspect row is generated
+    concurrently, so the wall time follows the slowest row rather than the
+    sum of all of them. The summary and recommendation are written last from
+    the assembled table.
+    """
+    with ComparisonProgress(items, live) as progress:
+        progress.update("Choosing aspects to compare...")
+        aspects = parse_aspects(_generate(create_aspects_prompt(items), model, ASPECTS_SCHEMA,
+                                          get_profile('compare_aspects')))
+        if not aspects:
+            raise Exception("The model did not return any aspects to compare")
         
-        # Process comparison points
-        if ':' in line and not collecting_descriptions:
-            if current_point:
-                sections['points'].append(current_point)
-            aspect = line.split(':', 1)[0].strip()
-            current_point = ComparisonPoint(
-                aspect=aspect,
-                descriptions=[],
-                similarities="",
-                differences=""
-            )
-            collecting_descriptions = True
-            continue
-            
-        if collecting_descriptions:
-            if 'similarities:' in lower_line:
-                current_point.similarities = line.split(':', 1)[1].strip()
-                continue
-            elif 'differences:' in lower_line:
-                current_point.differences = line.split(':', 1)[1].strip()
-                collecting_descriptions = False
-                continue
-            else:
-                current_point.descriptions.append(line)
-    
-    # Add the last point if exists
-    if current_point:
-        sections['points'].append(current_point)
+        rows: Dict[str, ComparisonPoint] = {}
+        # Rows grow with the number of items compared
+        row_profile = get_profile('compare_row', scale=(len(items) + 1) // 2)
+        progress.update(f"Comparing {len(aspects)} aspects...")
+        with ThreadPoolExecutor(max_workers=FANOUT_WORKERS) as executor:
+            futures = {
+                executor.submit(_generate, create_row_prompt(items, aspect), model,
+                                point_schema(items), row_profile): aspect
+                for aspect in aspects
+            }
+            for future in as_completed(futures):
+                aspect = futures[future]
+                try:
+                    point = point_from_json(items, future.result())
+                except GENERATION_ERRORS as e:
+                    console.print(f"[yellow]Skipping aspect {aspect}:[/yellow] {str(e)}")
+                    continue
+                if point:
+                    # Keep the requested aspect name so rows line up with the aspect list
+                    point.aspect = aspect
+                    rows[aspect] = point
+                # Rows finish out of order; show them in the order of the aspect list
+                progress.show([rows[a] for a in aspects if a in rows],
+                              f"Compared {len(rows)}/{len(aspects)} aspects...")
+        
+        points = [rows[aspect] for aspect in aspects if aspect in rows]
+        if not points:
+            raise Exception("No aspect could be compared")
+        
+        progress.update("Writing summary and recommendation...")
+        try:
+            verdict = _generate(create_verdict_prompt(items, points), model, VERDICT_SCHEMA,
+                                get_profile('compare_verdict'))
+        except GENERATION_ERRORS as e:
+            # The rows are still worth showing without a verdict
+            console.print(f"[yellow]Could not write the summary:[/yellow] {str(e)}")
+            verdict = None
     
-    return sections
+    result = comparison_from_json(items, verdict)
+    result.points = points
+    result.complete = len(points) == len(aspects) and has_verdict(verdict)
+    return result
 
-def display_comparison(result: ComparisonResult):
-    """Display the comparison in a rich formatted table."""
-    # Handle raw format
-    if len(result.points) == 1 and result.points[0].aspect == "Comparison":
-        console.print(Panel(Markdown(result.points[0].descriptions[0])))
-        return
-        
-    # Create main comparison table
-    table = Table(title=f"Comparison of {' vs '.join(result.items)}")
+def format_comparison_text(result: ComparisonResult) -> str:
+    """Format the comparison as plain text for indexing."""
+    lines = [f"Comparison of {' vs '.join(result.items)}", ""]
+    for point in result.points:
+        lines.append(point.aspect)
+        for item, desc in zip(result.items, point.descriptions):
+            lines.append(f"{item}: {desc}")
+        if point.similarities:
+            lines.append(f"Similarities: {point.similarities}")
+        if point.differences:
+            lines.append(f"Differences: {point.differences}")
+        lines.append("")
+    lines.append(f"Summary: {result.summary}")
+    lines.append(f"Recommendation: {result.recommendation}")
+    return "\n".join(lines)
+
+def build_comparison_table(items: List[str], points: List[ComparisonPoint]) -> Table:
+    """Build the rich table of a comparison."""
+    table = Table(title=f"Comparison of {' vs '.join(items)}")
     
     # Add columns
     table.add_column("Aspect", style="bold blue")
-    for item in result.items:
+    for item in items:
         table.add_column(item, style="green")
     table.add_column("Similarities", style="yellow")
     table.add_column("Differences", style="red")
     
     # Add rows
-    for point in result.points:
+    for point in points:
         row = [point.aspect]
         for desc in point.descriptions:
             row.append(desc)
@@ -444,8 +635,22 @@ def display_comparison(result: ComparisonResult):
         row.append(point.differences)
         table.add_row(*row)
     
-    # Display the table
-    console.print(table)
+    return table
+
+def display_comparison(result: ComparisonResult, show_table: bool = True):
+    """Display the comparison in a rich formatted table.
+    
+    Args:
+        result: The comparison to display
+        show_table: False when the table was already shown while streaming
+    """
+    # Handle raw format
+    if len(result.points) == 1 and result.points[0].aspect == "Comparison":
+        console.print(Panel(Markdown(result.points[0].descriptions[0])))
+        return
+    
+    if show_table:
+        console.print(build_comparison_table(result.items, result.points))
     
     # Display summary and recommendation
     if result.summary != 'No summary available':
@@ -456,8 +661,8 @@ def display_comparison(result: ComparisonResult):
         console.print("\n[bold blue]Recommendation:[/bold blue]")
         console.print(Panel(Markdown(result.recommendation)))
 
-def save_comparison_image(result: ComparisonResult, base_path: str = None) -> str:
-    """Generate and save an image of the comparison."""
+def get_comparison_image_path(result: ComparisonResult, base_path: str = None, extension: str = 'png') -> str:
+    """Get a new file path for a comparison output."""
     if base_path is None:
         base_path = os.getenv('DEFAULT_PATH', 'D:/Fiber_Notes')
     
@@ -468,8 +673,17 @@ def save_comparison_image(result: ComparisonResult, base_path: str = None) -> st
     # Generate filename
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     items_text = '_vs_'.join(item.replace(' ', '_') for item in result.items)
-    filename = f"comparison_{items_text}_{timestamp}.png"
-    filepath = comparison_dir / filename
+    filename = f"comparison_{items_text}_{timestamp}.{extension}"
+    return str(comparison_dir / filename)
+
+def save_comparison_image(result: ComparisonResult, base_path: str = None, filepath: str = None,
+                          fmt: str = 'png') -> str:
+    """Generate and save the comparison as a PNG image, SVG drawing or HTML page."""
+    if filepath is None:
+        filepath = get_comparison_image_path(result, base_path, extension=fmt)
+    
+    if fmt in VECTOR_RENDERERS:
+        return save_comparison_vector(result, filepath, fmt)
     
     # Generate and save image
     generator = ImageGenerator()
@@ -477,3 +691,16 @@ def save_comparison_image(result: ComparisonResult, base_path: str = None) -> st
     img.save(filepath)
     
     return str(filepath)
+
+# Single background worker so rendering never competes with the terminal output
+_render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='fiber-render')
+
+def save_comparison_image_async(result: ComparisonResult, base_path: str = None,
+                                filepath: str = None, fmt: str = 'png') -> Future:
+    """
+    Render and save the comparison on a background thread.
+    
+    Returns:
+        A future resolving to the saved file path
+    """
+    return _render_executor.submit(save_comparison_image, result, base_path, filepath, fmt)
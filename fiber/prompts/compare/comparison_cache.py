@@ -0,0 +1,66 @@
+"""On-disk cache of comparison results.
+
+Results are keyed by the set of items rather than their order, so
+"Python vs Rust" and "Rust vs Python" share one entry, together with the
+model and the version of the comparison prompt that produced them.
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fiber.atomic_files import write_json
+
+CACHE_DIR = Path.home() / '.fiber' / 'cache' / 'comparisons'
+
+# How long a cached comparison is reused (seconds)
+COMPARISON_CACHE_TTL = 30 * 24 * 60 * 60
+
+
+def canonical_item(item: str) -> str:
+    """Normalize an item name so spacing and case do not matter."""
+    return ' '.join(item.split()).casefold()
+
+
+def comparison_index_key(items: List[str]) -> str:
+    """Get the local index key of a comparison, so reruns replace the indexed copy."""
+    return f"comparison:{' vs '.join(sorted(canonical_item(item) for item in items))}"
+
+
+def comparison_key(items: List[str], model: str, prompt_version: int) -> str:
+    """Get the cache key of a comparison, independent of the item order."""
+    canonical = sorted(canonical_item(item) for item in items)
+    payload = json.dumps([canonical, model, prompt_version])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_comparison(items: List[str], model: str, prompt_version: int,
+                    max_age: Optional[float] = COMPARISON_CACHE_TTL) -> Optional[Dict]:
+    """
+    Load a cached comparison of the same items.
+
+    Returns:
+        Dict with 'items', 'points', 'summary' and 'recommendation' in the
+        item order it was generated with, or None if missing or stale
+    """
+    path = CACHE_DIR / f"{comparison_key(items, model, prompt_version)}.json"
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if max_age is not None and time.time() - entry.get('created_at', 0) > max_age:
+        return None
+    return entry
+
+
+def store_comparison(items: List[str], model: str, prompt_version: int, data: Dict):
+    """Store a comparison; data holds the fields of a ComparisonResult."""
+    path = CACHE_DIR / f"{comparison_key(items, model, prompt_version)}.json"
+    try:
+        write_json(path, {**data, 'model': model, 'created_at': time.time()})
+    except Exception:
+        # The cache is an optimization; never fail a comparison because of it
+        pass
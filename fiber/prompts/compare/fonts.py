@@ -0,0 +1,107 @@
+"""Font discovery and caching for comparison images.
+
+Fonts are looked up once per process in the usual system font directories
+and every loaded face is shared, so repeated renders never touch the disk.
+"""
+
+import os
+import sys
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PIL import ImageFont
+
+# Preferred font files in order; the first one found is used
+FONT_CANDIDATES = [
+    'arial.ttf',
+    'helvetica.ttc',
+    'dejavusans.ttf',
+    'liberationsans-regular.ttf',
+    'notosans-regular.ttf',
+    'opensans-regular.ttf',
+    'freesans.ttf',
+    'ubuntu-r.ttf',
+]
+
+
+def get_font_dirs() -> List[Path]:
+    """Get the system font directories for this platform."""
+    home = Path.home()
+    if sys.platform.startswith('win'):
+        windir = os.environ.get('WINDIR', 'C:/Windows')
+        return [
+            Path(windir) / 'Fonts',
+            home / 'AppData' / 'Local' / 'Microsoft' / 'Windows' / 'Fonts',
+        ]
+    if sys.platform == 'darwin':
+        return [
+            home / 'Library' / 'Fonts',
+            Path('/Library/Fonts'),
+            Path('/System/Library/Fonts'),
+            Path('/System/Library/Fonts/Supplemental'),
+        ]
+    data_dirs = os.environ.get('XDG_DATA_DIRS', '/usr/local/share:/usr/share').split(':')
+    return [
+        home / '.fonts',
+        home / '.local' / 'share' / 'fonts',
+        *(Path(d) / 'fonts' for d in data_dirs if d),
+    ]
+
+
+@lru_cache(maxsize=None)
+def list_system_fonts() -> Dict[str, str]:
+    """Map lowercase font file names to their paths, scanning the font directories once."""
+    fonts = {}
+    for font_dir in get_font_dirs():
+        if not font_dir.is_dir():
+            continue
+        for root, _, files in os.walk(font_dir):
+            for name in files:
+                if name.lower().endswith(('.ttf', '.ttc', '.otf')):
+                    fonts.setdefault(name.lower(), os.path.join(root, name))
+    return fonts
+
+
+@lru_cache(maxsize=None)
+def find_font_file() -> Optional[str]:
+    """
+    Find the font file used for rendering.
+
+    The FIBER_FONT environment variable can point to a specific font file.
+    """
+    override = os.getenv('FIBER_FONT')
+    if override and os.path.isfile(override):
+        return override
+
+    fonts = list_system_fonts()
+    for candidate in FONT_CANDIDATES:
+        if candidate in fonts:
+            return fonts[candidate]
+    return None
+
+
+_font_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _load_font(size: int) -> ImageFont.ImageFont:
+    """Load the rendering font at a size."""
+    path = find_font_file()
+    if path:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            pass
+    try:
+        # Pillow >= 10.1 ships a scalable default font
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def get_font(size: int) -> ImageFont.ImageFont:
+    """Get the shared rendering font at a size."""
+    with _font_lock:
+        return _load_font(size)
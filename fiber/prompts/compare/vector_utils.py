@@ -0,0 +1,160 @@
+"""SVG and HTML output for comparisons.
+
+Both formats are plain text, so they are written much faster than a PNG,
+are a fraction of its size and keep the comparison text searchable.
+"""
+
+import textwrap
+from datetime import datetime
+from html import escape
+from typing import List
+
+# Layout matching the PNG renderer
+WIDTH = 1200
+PADDING = 20
+LINE_HEIGHT = 30
+TITLE_SIZE = 36
+HEADER_SIZE = 24
+TEXT_SIZE = 20
+
+# Average glyph width relative to the font size for sans-serif text
+CHAR_WIDTH = 0.5
+
+FONT_FAMILY = "Arial, Helvetica, 'DejaVu Sans', 'Liberation Sans', sans-serif"
+
+COLORS = {
+    'background': '#ffffff',
+    'title': '#2f5496',
+    'header': '#000000',
+    'text': '#3c3c3c',
+    'border': '#c8c8c8',
+    'highlight': '#4682b4'
+}
+
+
+def _wrap(text: str, width_px: int, font_size: int = TEXT_SIZE) -> List[str]:
+    """Wrap text to a pixel width using an average glyph width."""
+    chars = max(10, int(width_px / (font_size * CHAR_WIDTH)))
+    return textwrap.wrap(text, chars) or ['']
+
+
+def render_comparison_svg(result) -> str:
+    """Render a ComparisonResult as a standalone SVG document."""
+    elements: List[str] = []
+    y = PADDING
+    content_width = WIDTH - 2 * PADDING
+
+    def text(x: int, y: int, value: str, size: int, color: str, bold: bool = False):
+        weight = ' font-weight="bold"' if bold else ''
+        elements.append(
+            f'<text x="{x}" y="{y + size}" font-size="{size}" fill="{color}"{weight}>'
+            f'{escape(value)}</text>'
+        )
+
+    def block(x: int, y: int, value: str, width: int, color: str) -> int:
+        lines = _wrap(value, width)
+        for i, line in enumerate(lines):
+            text(x, y + i * LINE_HEIGHT, line, TEXT_SIZE, color)
+        return len(lines) * LINE_HEIGHT
+
+    text(PADDING, y, f"Comparison of {' vs '.join(result.items)}", TITLE_SIZE, COLORS['title'], bold=True)
+    y += LINE_HEIGHT * 2
+
+    col_width = (content_width - PADDING) // max(1, len(result.items))
+    for point in result.points:
+        text(PADDING, y, point.aspect, HEADER_SIZE, COLORS['header'], bold=True)
+        y += LINE_HEIGHT
+
+        max_height = 0
+        for i, desc in enumerate(point.descriptions):
+            x = PADDING + i * col_width
+            max_height = max(max_height, block(x, y, desc, col_width - PADDING, COLORS['text']))
+        y += max_height + PADDING
+
+        if point.similarities:
+            y += block(PADDING, y, f"Similarities: {point.similarities}", content_width, COLORS['highlight']) + PADDING
+        if point.differences:
+            y += block(PADDING, y, f"Differences: {point.differences}", content_width, COLORS['highlight']) + PADDING
+
+    for label, value, missing in (
+        ("Summary:", result.summary, 'No summary available'),
+        ("Recommendation:", result.recommendation, 'No recommendation available'),
+    ):
+        if value != missing:
+            text(PADDING, y, label, HEADER_SIZE, COLORS['header'], bold=True)
+            y += LINE_HEIGHT
+            y += block(PADDING, y, value, content_width, COLORS['text']) + PADDING
+
+    height = y + PADDING
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{height}" '
+        f'viewBox="0 0 {WIDTH} {height}" font-family="{FONT_FAMILY}">\n'
+        f'<title>{escape("Comparison of " + " vs ".join(result.items))}</title>\n'
+        f'<rect width="100%" height="100%" fill="{COLORS["background"]}"/>\n'
+        + '\n'.join(elements)
+        + '\n</svg>\n'
+    )
+
+
+def render_comparison_html(result) -> str:
+    """Render a ComparisonResult as a self-contained HTML page."""
+    title = escape(f"Comparison of {' vs '.join(result.items)}")
+
+    header_cells = ''.join(f'<th>{escape(item)}</th>' for item in result.items)
+    rows = []
+    for point in result.points:
+        cells = ''.join(f'<td>{escape(desc)}</td>' for desc in point.descriptions)
+        rows.append(
+            f'<tr><th scope="row">{escape(point.aspect)}</th>{cells}'
+            f'<td class="similar">{escape(point.similarities)}</td>'
+            f'<td class="different">{escape(point.differences)}</td></tr>'
+        )
+
+    sections = []
+    if result.summary != 'No summary available':
+        sections.append(f'<h2>Summary</h2>\n<p>{escape(result.summary)}</p>')
+    if result.recommendation != 'No recommendation available':
+        sections.append(f'<h2>Recommendation</h2>\n<p>{escape(result.recommendation)}</p>')
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: {FONT_FAMILY}; color: {COLORS['text']}; max-width: {WIDTH}px; margin: 2em auto; padding: 0 {PADDING}px; }}
+h1 {{ color: {COLORS['title']}; }}
+h2 {{ color: {COLORS['header']}; }}
+table {{ border-collapse: collapse; width: 100%; }}
+th, td {{ border: 1px solid {COLORS['border']}; padding: 8px; text-align: left; vertical-align: top; }}
+thead th {{ background: #f4f6fa; }}
+.similar, .different {{ color: {COLORS['highlight']}; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<table>
+<thead><tr><th>Aspect</th>{header_cells}<th>Similarities</th><th>Differences</th></tr></thead>
+<tbody>
+{chr(10).join(rows)}
+</tbody>
+</table>
+{chr(10).join(sections)}
+<footer><p><small>Generated by Fiber on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</small></p></footer>
+</body>
+</html>
+"""
+
+
+# Output formats and their renderers
+VECTOR_RENDERERS = {
+    'svg': render_comparison_svg,
+    'html': render_comparison_html,
+}
+
+
+def save_comparison_vector(result, filepath: str, fmt: str) -> str:
+    """Render a comparison as SVG or HTML and save it."""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(VECTOR_RENDERERS[fmt](result))
+    return filepath
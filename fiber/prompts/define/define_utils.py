@@ -1,21 +1,54 @@
 """Definition utilities for Fiber."""
 
 import requests
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
 import os
 import json
 
-def get_word_definition(word: str) -> Optional[str]:
-    """Get a simple, concise definition of a word."""
-    word = word.strip().lower()
+from fiber.generation_profiles import get_profile
+from fiber.prompts.define.definition_cache import get_definition_cache
+from fiber.prompts.define.dictionary_store import lookup_word
+from fiber.structured_output import OllamaError, generate_json
+
+DEFINITION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "part_of_speech": {"type": "string"},
+        "definition": {"type": "string"}
+    },
+    "required": ["part_of_speech", "definition"]
+}
+
+# Concurrent lookups for `fiber define word1 word2 ...`
+DEFINE_WORKERS = int(os.getenv('FIBER_DEFINE_WORKERS', '8'))
+
+def lookup_local_definition(word: str) -> Optional[str]:
+    """Look a word up in the offline dictionary."""
+    entry = lookup_word(word)
+    if not entry:
+        return None
+    part_of_speech, definition = entry
+    definition = definition[0].upper() + definition[1:]
+    if part_of_speech:
+        return f"({part_of_speech}) {definition}"
+    return definition
+
+def fetch_api_definition(word: str) -> Tuple[Optional[str], bool]:
+    """
+    Look a word up with the Free Dictionary API.
     
+    Returns:
+        Tuple of (definition or None, whether the API reported the word as unknown)
+    """
     try:
-        # Try Free Dictionary API first
         response = requests.get(
             f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}",
             timeout=10
         )
         
+        if response.status_code == 404:
+            return None, True
         if response.status_code == 200:
             data = response.json()[0]
             # Get the first definition from the first meaning
@@ -26,40 +59,93 @@ def get_word_definition(word: str) -> Optional[str]:
                 if definitions:
                     definition = definitions[0]['definition'].capitalize()
                     if part_of_speech:
-                        return f"({part_of_speech}) {definition}"
-                    return definition
+                        return f"({part_of_speech}) {definition}", False
+                    return definition, False
+            return None, True
     except (requests.RequestException, json.JSONDecodeError, IndexError, KeyError):
         pass
+    return None, False
 
-    # Fallback to Ollama for a simple definition
+def generate_definition(word: str) -> Optional[str]:
+    """Ask Ollama for a simple definition."""
     try:
         model = os.getenv('OLLAMA_MODEL', 'qwen:7b')
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
-                "model": model,
-                "prompt": (
-                    f'Define the word "{word}" in one clear, concise sentence. '
-                    'Include the part of speech in parentheses at the start. '
-                    'Example format: "(noun) A clear definition here."'
-                ),
-                "stream": False
-            },
-            timeout=30
+        data = generate_json(
+            f'Define the word "{word}" in one clear, concise sentence. '
+            'Respond in JSON with its "part_of_speech" and the "definition".',
+            model,
+            DEFINITION_SCHEMA,
+            get_profile('define').options(),
+            timeout=30,
+            is_complete=lambda partial: isinstance(partial, dict) and 'definition' in partial
         )
-        
-        if response.status_code == 200:
-            definition = response.json().get("response", "").strip()
+        if isinstance(data, dict):
+            definition = str(data.get('definition') or '').strip().strip('"').rstrip('.')
+            part_of_speech = str(data.get('part_of_speech') or '').strip().strip('()').lower()
             if definition:
-                # Clean up any extra quotes or periods at the end
-                definition = definition.strip('"').rstrip('.')
-                return definition + "."
+                definition = definition[0].upper() + definition[1:] + "."
+                if part_of_speech:
+                    return f"({part_of_speech}) {definition}"
+                return definition
 
-    except (requests.RequestException, json.JSONDecodeError):
+    except (requests.RequestException, json.JSONDecodeError, OllamaError):
         pass
     
     return None
 
+def get_word_definition(word: str, save: bool = True) -> Optional[str]:
+    """Get a simple, concise definition of a word.
+    
+    Sources are tried in order: the offline dictionary, the definition
+    cache, the Free Dictionary API and finally Ollama.
+    
+    Args:
+        word: The word to define
+        save: Save the definition cache afterwards; batch lookups save once at the end
+    """
+    word = word.strip().lower()
+    
+    # The local dictionary answers offline in milliseconds when it has the word
+    definition = lookup_local_definition(word)
+    if definition:
+        return definition
+    
+    cache = get_definition_cache()
+    entry = cache.get(word)
+    if entry and entry['definition']:
+        return entry['definition']
+    
+    # A cached miss means the API does not know the word; go straight to the model
+    if not entry:
+        definition, unknown = fetch_api_definition(word)
+        if definition or unknown:
+            cache.put(word, definition)
+    
+    if not definition:
+        definition = generate_definition(word)
+        if definition:
+            cache.put(word, definition)
+    
+    if save:
+        cache.save()
+    return definition
+
+def define_words(words: List[str], max_workers: int = DEFINE_WORKERS) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Look many words up concurrently.
+    
+    Yields:
+        Tuples of (word, definition or None) in the order of the words, each
+        as soon as it and every word before it have resolved
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(get_word_definition, word, False) for word in words]
+        try:
+            for word, future in zip(words, futures):
+                yield word, future.result()
+        finally:
+            get_definition_cache().save()
+
 def display_definition(definition: str):
     """Display the word definition in a simple format."""
     print(f"{definition}")
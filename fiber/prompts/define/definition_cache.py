@@ -0,0 +1,87 @@
+"""Cache of looked-up definitions.
+
+Found definitions are kept for a month. Words the dictionary API does not
+know (404s) are remembered for a day, so the API is not asked about them
+again on every lookup and they go straight to the model.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from fiber.atomic_files import write_json
+
+CACHE_FILE = Path.home() / '.fiber' / 'cache' / 'definitions.json'
+
+# How long found definitions and dictionary misses are reused (seconds)
+POSITIVE_TTL = 30 * 24 * 60 * 60
+NEGATIVE_TTL = 24 * 60 * 60
+
+
+class DefinitionCache:
+    """Thread-safe definition cache saved as one JSON file."""
+
+    def __init__(self, cache_file: Path = None):
+        self.cache_file = cache_file or CACHE_FILE
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load cached entries from file, dropping expired ones."""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {word: entry for word, entry in entries.items() if self._fresh(entry)}
+
+    @staticmethod
+    def _fresh(entry: Dict) -> bool:
+        """Check whether an entry is still within its TTL."""
+        ttl = POSITIVE_TTL if entry.get('definition') else NEGATIVE_TTL
+        return time.time() - entry.get('cached_at', 0) <= ttl
+
+    def get(self, word: str) -> Optional[Dict]:
+        """
+        Get the cached entry of a word.
+
+        Returns:
+            Dict with 'definition' (None for a dictionary miss) or None if not cached
+        """
+        with self._lock:
+            entry = self.entries.get(word)
+        return entry if entry and self._fresh(entry) else None
+
+    def put(self, word: str, definition: Optional[str]):
+        """Cache a definition, or None to record a dictionary miss."""
+        with self._lock:
+            self.entries[word] = {'definition': definition, 'cached_at': time.time()}
+            self._dirty = True
+
+    def save(self):
+        """Save the cache to file if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = dict(self.entries)
+            self._dirty = False
+        try:
+            write_json(self.cache_file, data)
+        except Exception:
+            pass
+
+
+_cache: Optional[DefinitionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_definition_cache() -> DefinitionCache:
+    """Get the shared definition cache, loading it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DefinitionCache()
+        return _cache
@@ -0,0 +1,191 @@
+"""Offline dictionary for `fiber define`.
+
+Definitions are bulk-imported into a SQLite table keyed by the lowercase
+word, so a lookup is a single primary-key probe that answers in about a
+millisecond without any network access. Supported import formats:
+
+- .csv / .tsv: word, part of speech, definition (or just word, definition)
+- .json: an object mapping words to definitions, or a list of
+  {"word", "part_of_speech", "definition"} objects
+- .jsonl: one object per line, either in the same shape or in the
+  Wiktextract format ({"word", "pos", "senses": [{"glosses": [...]}]})
+"""
+
+import csv
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+
+DICTIONARY_FILE = Path(os.getenv(
+    'FIBER_DICTIONARY', str(Path.home() / '.fiber' / 'dictionary' / 'words.db')
+))
+
+# Rows written per transaction batch while importing
+IMPORT_BATCH = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    word TEXT PRIMARY KEY,
+    part_of_speech TEXT,
+    definition TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+Entry = Tuple[str, str, str]
+
+
+def normalize_word(word: str) -> str:
+    """Get the lookup key of a word."""
+    return ' '.join(word.split()).lower()
+
+
+def lookup_word(word: str, dictionary_file: Path = None) -> Optional[Tuple[str, str]]:
+    """
+    Look a word up in the local dictionary.
+
+    Returns:
+        Tuple of (part of speech, definition), or None if the word or the
+        dictionary is missing
+    """
+    dictionary_file = dictionary_file or DICTIONARY_FILE
+    if not dictionary_file.exists():
+        return None
+    try:
+        conn = sqlite3.connect(f"{dictionary_file.as_uri()}?mode=ro", uri=True)
+        try:
+            row = conn.execute(
+                'SELECT part_of_speech, definition FROM words WHERE word = ?',
+                (normalize_word(word),)
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    return (row[0] or '', row[1]) if row else None
+
+
+def _entry(word, part_of_speech, definition) -> Optional[Entry]:
+    """Build an entry, or None if the word or definition is empty."""
+    word = normalize_word(str(word or ''))
+    definition = ' '.join(str(definition or '').split())
+    if not word or not definition:
+        return None
+    return word, str(part_of_speech or '').strip().lower(), definition
+
+
+def _entry_from_object(data) -> Optional[Entry]:
+    """Build an entry from a JSON object in either supported shape."""
+    if not isinstance(data, dict):
+        return None
+    definition = data.get('definition')
+    if not definition:
+        # Wiktextract: the first gloss of the first sense
+        for sense in data.get('senses') or []:
+            glosses = sense.get('glosses') or []
+            if glosses:
+                definition = glosses[0]
+                break
+    return _entry(data.get('word'), data.get('part_of_speech') or data.get('pos'), definition)
+
+
+def read_entries(path: Path) -> Iterator[Entry]:
+    """Read dictionary entries from a file."""
+    suffix = path.suffix.lower()
+
+    if suffix in ('.csv', '.tsv'):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.reader(f, delimiter='\t' if suffix == '.tsv' else ','):
+                if not row or row[0].strip().lower() == 'word':
+                    continue
+                if len(row) >= 3:
+                    entry = _entry(row[0], row[1], ','.join(row[2:]))
+                elif len(row) == 2:
+                    entry = _entry(row[0], '', row[1])
+                else:
+                    continue
+                if entry:
+                    yield entry
+
+    elif suffix == '.jsonl':
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = _entry_from_object(json.loads(line))
+                except ValueError:
+                    continue
+                if entry:
+                    yield entry
+
+    elif suffix == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            for word, value in data.items():
+                if isinstance(value, list):
+                    value = value[0] if value else ''
+                if isinstance(value, dict):
+                    entry = _entry_from_object({'word': word, **value})
+                else:
+                    entry = _entry(word, '', value)
+                if entry:
+                    yield entry
+        else:
+            for item in data:
+                entry = _entry_from_object(item)
+                if entry:
+                    yield entry
+
+    else:
+        raise ValueError(f"Unsupported dictionary format: {path.suffix or path.name}")
+
+
+def import_entries(entries: Iterable[Entry], dictionary_file: Path = None) -> int:
+    """
+    Bulk-import entries; the first definition of a word is kept.
+
+    Returns:
+        Number of entries read
+    """
+    dictionary_file = dictionary_file or DICTIONARY_FILE
+    dictionary_file.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(dictionary_file))
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=OFF')
+        conn.executescript(SCHEMA)
+        count, batch = 0, []
+        for entry in entries:
+            batch.append(entry)
+            if len(batch) >= IMPORT_BATCH:
+                with conn:
+                    conn.executemany('INSERT OR IGNORE INTO words VALUES (?, ?, ?)', batch)
+                count += len(batch)
+                batch = []
+        with conn:
+            conn.executemany('INSERT OR IGNORE INTO words VALUES (?, ?, ?)', batch)
+        count += len(batch)
+    finally:
+        conn.close()
+    return count
+
+
+def import_dictionary(path: str, dictionary_file: Path = None) -> int:
+    """Import a dictionary file into the local store and get the number of entries read."""
+    return import_entries(read_entries(Path(path)), dictionary_file)
+
+
+def dictionary_size(dictionary_file: Path = None) -> int:
+    """Get the number of words in the local dictionary."""
+    dictionary_file = dictionary_file or DICTIONARY_FILE
+    if not dictionary_file.exists():
+        return 0
+    try:
+        conn = sqlite3.connect(f"{dictionary_file.as_uri()}?mode=ro", uri=True)
+        try:
+            return conn.execute('SELECT COUNT(*) FROM words').fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return 0
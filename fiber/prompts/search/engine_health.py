@@ -0,0 +1,157 @@
+"""Health tracking and circuit breaking for web search engines."""
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List
+
+from fiber.atomic_files import write_json
+
+HEALTH_FILE = Path.home() / '.fiber' / 'cache' / 'engine_health.json'
+
+# Number of recent searches kept per engine
+WINDOW_SIZE = 20
+
+# Consecutive failed searches (errors or empty results) that open the breaker
+FAILURE_THRESHOLD = 3
+
+# Seconds an open breaker waits before letting a probe through; doubles on
+# every failed probe up to MAX_COOLDOWN
+BASE_COOLDOWN = 5 * 60
+MAX_COOLDOWN = 6 * 60 * 60
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+@dataclass
+class EngineHealth:
+    name: str
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    cooldown: float = BASE_COOLDOWN
+    opened_at: float = 0.0
+    last_error: str = ''
+    # Recent outcomes as [timestamp, latency, result_count, error]
+    history: List[list] = field(default_factory=list)
+
+    def record(self, latency: float, result_count: int, error: str = ''):
+        """Record the outcome of one search."""
+        self.history.append([time.time(), round(latency, 3), result_count, error])
+        self.history = self.history[-WINDOW_SIZE:]
+
+    @property
+    def samples(self) -> int:
+        return len(self.history)
+
+    @property
+    def avg_latency(self) -> float:
+        if not self.history:
+            return 0.0
+        return sum(entry[1] for entry in self.history) / len(self.history)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.history:
+            return 0.0
+        return sum(1 for entry in self.history if entry[3]) / len(self.history)
+
+    @property
+    def empty_rate(self) -> float:
+        if not self.history:
+            return 0.0
+        return sum(1 for entry in self.history if not entry[3] and entry[2] == 0) / len(self.history)
+
+    @property
+    def retry_at(self) -> float:
+        return self.opened_at + self.cooldown if self.state != CLOSED else 0.0
+
+
+class HealthTracker:
+    """Persisted per-engine health with a circuit breaker."""
+
+    def __init__(self, health_file: Path = None):
+        self.health_file = health_file or HEALTH_FILE
+        self.engines: Dict[str, EngineHealth] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Load engine health from file."""
+        try:
+            with open(self.health_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for name, values in data.items():
+                self.engines[name] = EngineHealth(**values)
+        except (OSError, ValueError, TypeError):
+            # Start fresh if there's an error
+            self.engines = {}
+
+    def save(self):
+        """Save engine health to file."""
+        try:
+            with self._lock:
+                data = {name: asdict(health) for name, health in self.engines.items()}
+            write_json(self.health_file, data, indent=4)
+        except Exception:
+            pass
+
+    def get(self, name: str) -> EngineHealth:
+        """Get the health record of an engine."""
+        with self._lock:
+            if name not in self.engines:
+                self.engines[name] = EngineHealth(name=name)
+            return self.engines[name]
+
+    def allow_request(self, name: str) -> bool:
+        """Check whether a search may be sent to an engine."""
+        health = self.get(name)
+        with self._lock:
+            if health.state == CLOSED:
+                return True
+            if time.time() >= health.retry_at:
+                # Let a single probe through per cooldown period
+                health.state = HALF_OPEN
+                health.opened_at = time.time()
+                return True
+            return False
+
+    def record_success(self, name: str, latency: float, result_count: int):
+        """Record a search that returned results."""
+        health = self.get(name)
+        with self._lock:
+            health.record(latency, result_count)
+            health.state = CLOSED
+            health.consecutive_failures = 0
+            health.cooldown = BASE_COOLDOWN
+            health.last_error = ''
+
+    def record_failure(self, name: str, latency: float, error: str = '') -> bool:
+        """
+        Record a search that failed or returned nothing.
+
+        Returns:
+            bool: True if this failure opened the breaker
+        """
+        health = self.get(name)
+        with self._lock:
+            health.record(latency, 0, error)
+            health.consecutive_failures += 1
+            health.last_error = error or 'No results'
+
+            if health.state == HALF_OPEN:
+                # Probe failed, back off further
+                health.cooldown = min(health.cooldown * 2, MAX_COOLDOWN)
+            elif health.state == OPEN or health.consecutive_failures < FAILURE_THRESHOLD:
+                return False
+
+            health.state = OPEN
+            health.opened_at = time.time()
+            return True
+
+
+# Global instance
+tracker = HealthTracker()
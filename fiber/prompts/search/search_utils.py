@@ -5,11 +5,14 @@ from bs4 import BeautifulSoup
 from urllib.parse import quote_plus
 import webbrowser
 from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple
 import re
+import time
 from dataclasses import dataclass
 from rich.console import Console
 
+from fiber.prompts.search.engine_health import tracker
+
 console = Console()
 
 @dataclass
@@ -19,103 +22,138 @@ class SearchResult:
     description: str
     relevance_score: float = 0.0
 
-def get_google_results(query: str, num_results: int = 5) -> List[SearchResult]:
-    """Get search results from Google."""
+def run_engine(name: str, search: Callable[[str, int], List[SearchResult]],
+               query: str, num_results: int) -> List[SearchResult]:
+    """Run a search engine through its circuit breaker and record its health."""
+    if not tracker.allow_request(name):
+        return []
+    
+    start = time.perf_counter()
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        url = f'https://www.google.com/search?q={quote_plus(query)}&num={num_results}'
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        results = []
-        for div in soup.find_all('div', class_='g'):
-            try:
-                title_elem = div.find('h3')
-                link_elem = div.find('a')
-                desc_elem = div.find('div', class_='VwiC3b')
-                
-                if title_elem and link_elem and desc_elem:
-                    title = title_elem.text
-                    url = link_elem['href']
-                    description = desc_elem.text
-                    
-                    if url.startswith('http'):
-                        results.append(SearchResult(url, title, description))
-            except Exception:
-                continue
-                
-        return results
+        results = search(query, num_results)
     except Exception as e:
-        console.print(f"[yellow]Warning: Google search failed: {str(e)}[/yellow]")
+        if tracker.record_failure(name, time.perf_counter() - start, str(e)):
+            console.print(f"[yellow]Warning: {name} search failed ({str(e)}), skipping it for a while[/yellow]")
+        tracker.save()
         return []
+    
+    latency = time.perf_counter() - start
+    if results:
+        tracker.record_success(name, latency, len(results))
+    elif tracker.record_failure(name, latency):
+        console.print(f"[yellow]Warning: {name} keeps returning no results, skipping it for a while[/yellow]")
+    tracker.save()
+    return results
+
+def _search_google(query: str, num_results: int = 5) -> List[SearchResult]:
+    """Scrape search results from Google."""
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    url = f'https://www.google.com/search?q={quote_plus(query)}&num={num_results}'
+    response = requests.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    if '/sorry/' in response.url or 'unusual traffic' in response.text:
+        raise Exception("Blocked by captcha")
+    soup = BeautifulSoup(response.text, 'html.parser')
+    
+    results = []
+    for div in soup.find_all('div', class_='g'):
+        try:
+            title_elem = div.find('h3')
+            link_elem = div.find('a')
+            desc_elem = div.find('div', class_='VwiC3b')
+            
+            if title_elem and link_elem and desc_elem:
+                title = title_elem.text
+                url = link_elem['href']
+                description = desc_elem.text
+                
+                if url.startswith('http'):
+                    results.append(SearchResult(url, title, description))
+        except Exception:
+            continue
+            
+    return results
+
+def get_google_results(query: str, num_results: int = 5) -> List[SearchResult]:
+    """Get search results from Google."""
+    return run_engine("Google", _search_google, query, num_results)
+
+def _search_bing(query: str, num_results: int = 5) -> List[SearchResult]:
+    """Scrape search results from Bing."""
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    url = f'https://www.bing.com/search?q={quote_plus(query)}&count={num_results}'
+    response = requests.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, 'html.parser')
+    
+    results = []
+    for li in soup.find_all('li', class_='b_algo'):
+        try:
+            title_elem = li.find('h2')
+            link_elem = title_elem.find('a') if title_elem else None
+            desc_elem = li.find('div', class_='b_caption')
+            
+            if title_elem and link_elem and desc_elem:
+                title = title_elem.text
+                url = link_elem['href']
+                description = desc_elem.text
+                
+                if url.startswith('http'):
+                    results.append(SearchResult(url, title, description))
+        except Exception:
+            continue
+            
+    return results
 
 def get_bing_results(query: str, num_results: int = 5) -> List[SearchResult]:
     """Get search results from Bing."""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        url = f'https://www.bing.com/search?q={quote_plus(query)}&count={num_results}'
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        results = []
-        for li in soup.find_all('li', class_='b_algo'):
-            try:
-                title_elem = li.find('h2')
-                link_elem = title_elem.find('a') if title_elem else None
-                desc_elem = li.find('div', class_='b_caption')
+    return run_engine("Bing", _search_bing, query, num_results)
+
+def _search_duckduckgo(query: str, num_results: int = 5) -> List[SearchResult]:
+    """Scrape search results from DuckDuckGo."""
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    url = f'https://html.duckduckgo.com/html/?q={quote_plus(query)}'
+    response = requests.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, 'html.parser')
+    
+    results = []
+    for div in soup.find_all('div', class_='result'):
+        try:
+            title_elem = div.find('a', class_='result__a')
+            desc_elem = div.find('a', class_='result__snippet')
+            
+            if title_elem and desc_elem:
+                title = title_elem.text
+                url = title_elem['href']
+                description = desc_elem.text
                 
-                if title_elem and link_elem and desc_elem:
-                    title = title_elem.text
-                    url = link_elem['href']
-                    description = desc_elem.text
+                if url.startswith('http'):
+                    results.append(SearchResult(url, title, description))
                     
-                    if url.startswith('http'):
-                        results.append(SearchResult(url, title, description))
-            except Exception:
-                continue
-                
-        return results
-    except Exception as e:
-        console.print(f"[yellow]Warning: Bing search failed: {str(e)}[/yellow]")
-        return []
+                    if len(results) >= num_results:
+                        break
+        except Exception:
+            continue
+            
+    return results
 
 def get_duckduckgo_results(query: str, num_results: int = 5) -> List[SearchResult]:
     """Get search results from DuckDuckGo."""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        url = f'https://html.duckduckgo.com/html/?q={quote_plus(query)}'
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        results = []
-        for div in soup.find_all('div', class_='result'):
-            try:
-                title_elem = div.find('a', class_='result__a')
-                desc_elem = div.find('a', class_='result__snippet')
-                
-                if title_elem and desc_elem:
-                    title = title_elem.text
-                    url = title_elem['href']
-                    description = desc_elem.text
-                    
-                    if url.startswith('http'):
-                        results.append(SearchResult(url, title, description))
-                        
-                        if len(results) >= num_results:
-                            break
-            except Exception:
-                continue
-                
-        return results
-    except Exception as e:
-        console.print(f"[yellow]Warning: DuckDuckGo search failed: {str(e)}[/yellow]")
-        return []
+    return run_engine("DuckDuckGo", _search_duckduckgo, query, num_results)
+
+# Search engines in the order their results are ranked on ties
+ENGINES = {
+    "Google": get_google_results,
+    "Bing": get_bing_results,
+    "DuckDuckGo": get_duckduckgo_results
+}
 
 def calculate_relevance_score(result: SearchResult, query: str) -> float:
     """Calculate relevance score for a search result."""
@@ -145,38 +183,47 @@ def calculate_relevance_score(result: SearchResult, query: str) -> float:
     
     return score
 
-def get_best_result(query: str) -> Tuple[SearchResult, str]:
-    """Get the most relevant search result from all search engines."""
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        # Start all searches in parallel
-        future_google = executor.submit(get_google_results, query)
-        future_bing = executor.submit(get_bing_results, query)
-        future_ddg = executor.submit(get_duckduckgo_results, query)
-        
-        # Collect all results
-        all_results = []
-        sources = []
+def get_ranked_results(query: str) -> List[Tuple[SearchResult, str]]:
+    """Get results from all healthy search engines, most relevant first."""
+    all_results = []
+    with ThreadPoolExecutor(max_workers=len(ENGINES)) as executor:
+        # Start all searches in parallel; engines with an open breaker return immediately
+        futures = [(executor.submit(search, query), name) for name, search in ENGINES.items()]
         
-        for future, source in [(future_google, "Google"), 
-                             (future_bing, "Bing"), 
-                             (future_ddg, "DuckDuckGo")]:
+        for future, source in futures:
             try:
-                results = future.result()
-                for result in results:
+                for result in future.result():
                     result.relevance_score = calculate_relevance_score(result, query)
-                    all_results.append(result)
-                    sources.append(source)
+                    all_results.append((result, source))
             except Exception as e:
                 console.print(f"[yellow]Warning: {source} search failed: {str(e)}[/yellow]")
     
-    if not all_results:
+    return sorted(all_results, key=lambda pair: pair[0].relevance_score, reverse=True)
+
+def get_best_result(query: str) -> Tuple[SearchResult, str]:
+    """Get the most relevant search result from all search engines."""
+    ranked = get_ranked_results(query)
+    if not ranked:
         raise Exception("No search results found from any search engine")
     
-    # Find the most relevant result
-    best_result = max(all_results, key=lambda x: x.relevance_score)
-    best_source = sources[all_results.index(best_result)]
-    
-    return best_result, best_source
+    return ranked[0]
+
+def get_engine_status() -> List[Dict]:
+    """Get the health and breaker state of every search engine."""
+    status = []
+    for name in ENGINES:
+        health = tracker.get(name)
+        status.append({
+            'name': name,
+            'state': health.state,
+            'samples': health.samples,
+            'avg_latency': health.avg_latency,
+            'error_rate': health.error_rate,
+            'empty_rate': health.empty_rate,
+            'retry_at': health.retry_at,
+            'last_error': health.last_error
+        })
+    return status
 
 def open_in_chrome(url: str):
     """Open URL in Chrome browser."""
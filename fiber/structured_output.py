@@ -0,0 +1,169 @@
+"""Schema-constrained JSON generation with Ollama.
+
+Ollama's `format` option constrains the model to JSON matching a schema, so
+responses no longer have to be scraped out of free text. The response is
+parsed while it streams, and a stream cut short still yields every value
+that was completed before it ended.
+"""
+
+import json
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+OLLAMA_GENERATE_URL = "http://localhost:11434/api/generate"
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+class OllamaError(RuntimeError):
+    """Ollama answered a generation request with an error status."""
+
+
+class TruncatedGeneration(OllamaError):
+    """The generation hit its token cap (num_predict) before the answer was finished."""
+
+    def __init__(self, value: Any):
+        super().__init__("The response was cut off at the generation token limit")
+        # Whatever was completed before the cut, as parsed by parse_partial_json
+        self.value = value
+
+
+def parse_partial_json(text: str) -> Optional[Any]:
+    """
+    Parse JSON that may have been cut off part way through.
+
+    The text is truncated after the last complete value (closed string,
+    object or array) and the containers still open at that point are closed.
+    Strings and numbers that were still being written are dropped rather
+    than guessed.
+
+    Returns:
+        The parsed value, or None if no complete value was found
+    """
+    start = min((i for i in (text.find('{'), text.find('[')) if i >= 0), default=-1)
+    if start < 0:
+        return None
+    text = text[start:]
+
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    stack = []
+    in_string = escaped = string_is_key = expect_key = False
+    safe_end, safe_stack = 0, []
+
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+                if not string_is_key:
+                    safe_end, safe_stack = i + 1, list(stack)
+            continue
+
+        if ch == '"':
+            in_string = True
+            string_is_key = bool(stack) and stack[-1] == '{' and expect_key
+        elif ch in '{[':
+            stack.append(ch)
+            expect_key = ch == '{'
+            safe_end, safe_stack = i + 1, list(stack)
+        elif ch in '}]':
+            if not stack:
+                break
+            stack.pop()
+            expect_key = False
+            safe_end, safe_stack = i + 1, list(stack)
+            if not stack:
+                break
+        elif ch == ':':
+            expect_key = False
+        elif ch == ',':
+            expect_key = bool(stack) and stack[-1] == '{'
+
+    candidate = text[:safe_end] + ''.join(_CLOSERS[c] for c in reversed(safe_stack))
+    try:
+        return json.loads(candidate)
+    except ValueError:
+        return None
+
+
+def generate_json(prompt: str, model: str, schema: Dict, options: Optional[Dict] = None,
+                  on_update: Optional[Callable[[Any], None]] = None, timeout: int = 60,
+                  is_complete: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+    """
+    Generate a JSON response constrained to a schema.
+
+    Args:
+        prompt: The prompt, which should also describe the expected fields
+        model: The Ollama model
+        schema: JSON schema passed as Ollama's `format`
+        options: Ollama generation options
+        on_update: Called with the partially parsed value as the response streams
+        timeout: Request timeout in seconds
+        is_complete: Called with the partially parsed value; returning True
+            closes the stream, which makes Ollama stop generating
+
+    Returns:
+        The parsed value, or None if the model returned nothing usable
+
+    Raises:
+        OllamaError: If Ollama returns an error status
+        TruncatedGeneration: If the response was cut off by num_predict; the
+            partial value is kept on the exception
+    """
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": True,
+        "format": schema,
+        "options": options or {}
+    }
+    response = requests.post(OLLAMA_GENERATE_URL, json=payload, stream=True, timeout=timeout)
+    if response.status_code == 400:
+        # Ollama before 0.5 only understands the plain "json" format
+        payload["format"] = "json"
+        response = requests.post(OLLAMA_GENERATE_URL, json=payload, stream=True, timeout=timeout)
+    if response.status_code != 200:
+        raise OllamaError(f"Ollama API returned status code {response.status_code}")
+
+    content = []
+    done_reason = None
+    try:
+        for line in response.iter_lines():
+            if not line:
+                continue
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if message.get('done'):
+                done_reason = message.get('done_reason')
+            chunk = message.get('response', '')
+            content.append(chunk)
+            # Only reparse when a value may have just been completed
+            if (on_update or is_complete) and any(c in chunk for c in '"}]'):
+                partial = parse_partial_json(''.join(content))
+                if partial is None:
+                    continue
+                if on_update:
+                    on_update(partial)
+                if is_complete and is_complete(partial):
+                    # Ollama aborts the generation when the client disconnects
+                    response.close()
+                    break
+    except requests.exceptions.ChunkedEncodingError:
+        # Keep whatever was completed before the stream broke
+        if not content:
+            raise
+
+    value = parse_partial_json(''.join(content))
+    if done_reason == 'length':
+        raise TruncatedGeneration(value)
+    return value
@@ -0,0 +1,149 @@
+"""Token estimation and context budgeting for Ollama prompts.
+
+Ollama silently truncates prompts longer than its `num_ctx` and spends
+prompt-evaluation time on every token it does keep, so prompts are sized
+against the model's context before they are sent.
+"""
+
+import os
+import re
+from typing import Dict, Optional
+
+# Native context window of common model families, matched by name prefix
+MODEL_CONTEXT = {
+    'llama3.1': 131072,
+    'llama3.2': 131072,
+    'llama3.3': 131072,
+    'llama3': 8192,
+    'llama2': 4096,
+    'mistral': 32768,
+    'mixtral': 32768,
+    'qwen2.5': 32768,
+    'qwen2': 32768,
+    'qwen': 32768,
+    'gemma2': 8192,
+    'gemma': 8192,
+    'phi3': 4096,
+    'phi': 2048,
+}
+
+# Ollama's own default when the model is unknown
+DEFAULT_CONTEXT = 2048
+
+# Upper bound on num_ctx; larger contexts cost memory and prompt-eval time
+MAX_CONTEXT = int(os.getenv('OLLAMA_MAX_CTX', '8192'))
+
+# num_ctx is rounded up to a multiple of this so the model is not reloaded
+# for every small change in prompt size
+CONTEXT_STEP = 1024
+
+TRIM_MARKER = '\n\n[...]\n\n'
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of model tokens in a text.
+
+    Counts words and punctuation, adding a token for every few characters of
+    long words, which is within ~15% of BPE tokenizers on English prose.
+    """
+    tokens = 0
+    for match in _TOKEN_RE.finditer(text):
+        tokens += 1 + (match.end() - match.start()) // 7
+    return tokens
+
+
+def get_context_size(model: str) -> int:
+    """Get the usable context size for a model."""
+    name = model.lower().split('/')[-1]
+    for prefix in sorted(MODEL_CONTEXT, key=len, reverse=True):
+        if name.startswith(prefix):
+            return min(MODEL_CONTEXT[prefix], MAX_CONTEXT)
+    return min(DEFAULT_CONTEXT, MAX_CONTEXT)
+
+
+def compress_text(text: str) -> str:
+    """Shrink text without losing content: collapse whitespace and drop repeated lines."""
+    seen = set()
+    lines = []
+    for line in text.splitlines():
+        line = ' '.join(line.split())
+        if line and line in seen and len(line) > 20:
+            continue
+        seen.add(line)
+        lines.append(line)
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
+
+
+def trim_text(text: str, max_tokens: int) -> str:
+    """
+    Trim text to a token budget, keeping its beginning and end.
+
+    Whole paragraphs are kept where possible; the removed middle is replaced
+    with a marker so the model knows content was left out.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    budget = max(0, max_tokens - estimate_tokens(TRIM_MARKER))
+    head_budget = budget * 3 // 4
+    paragraphs = text.split('\n\n')
+
+    head, used = [], 0
+    for paragraph in paragraphs:
+        cost = estimate_tokens(paragraph)
+        if used + cost > head_budget:
+            if not head:
+                # A single huge paragraph: cut it on words
+                words = paragraph.split()
+                while words and estimate_tokens(' '.join(words)) > head_budget:
+                    words = words[:len(words) * 3 // 4]
+                head.append(' '.join(words))
+                used += estimate_tokens(head[-1])
+            break
+        head.append(paragraph)
+        used += cost
+
+    tail = []
+    for paragraph in reversed(paragraphs[len(head):]):
+        cost = estimate_tokens(paragraph)
+        if used + cost > budget:
+            break
+        tail.insert(0, paragraph)
+        used += cost
+
+    return '\n\n'.join(head) + TRIM_MARKER + '\n\n'.join(tail)
+
+
+class TokenBudget:
+    """Token budget for one prompt sent to a model."""
+
+    def __init__(self, model: str, output_tokens: int = 1024):
+        self.model = model
+        self.context_size = get_context_size(model)
+        self.output_tokens = min(output_tokens, self.context_size // 2)
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Tokens available for the prompt after reserving room for the output."""
+        return self.context_size - self.output_tokens
+
+    def available(self, *fixed_parts: str) -> int:
+        """Tokens left for variable content after the fixed parts of a prompt."""
+        used = sum(estimate_tokens(part) for part in fixed_parts)
+        return max(0, self.prompt_tokens - used)
+
+    def fit(self, text: str, max_tokens: Optional[int] = None) -> str:
+        """Compress and, if still too long, trim text to fit the budget."""
+        max_tokens = self.prompt_tokens if max_tokens is None else max_tokens
+        if estimate_tokens(text) <= max_tokens:
+            return text
+        return trim_text(compress_text(text), max_tokens)
+
+    def options(self, prompt: str) -> Dict[str, int]:
+        """Get Ollama options with num_ctx sized for the prompt and output."""
+        needed = estimate_tokens(prompt) + self.output_tokens
+        num_ctx = -(-needed // CONTEXT_STEP) * CONTEXT_STEP
+        return {'num_ctx': min(max(num_ctx, DEFAULT_CONTEXT), self.context_size)}
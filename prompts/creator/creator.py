@@ -6,6 +6,9 @@ from typing import Optional
 from dotenv import load_dotenv
 from rich.console import Console
 
+from fiber.atomic_files import AtomicTextFile
+from fiber.local_index import add_document
+
 console = Console()
 
 # Load environment variables
@@ -22,22 +25,97 @@ def get_default_path() -> str:
     os.makedirs(default_path, exist_ok=True)
     return default_path
 
+def get_document_path(topic: str) -> str:
+    """Get the file path of the document for a topic."""
+    # Clean the topic name for use in filename
+    clean_topic = "".join(c if c.isalnum() or c in " -_" else "_" for c in topic)
+    date_str = datetime.now().strftime("%Y%m%d")
+    filename = f"{date_str}_{clean_topic}.txt"
+    return os.path.join(get_default_path(), filename)
+
+class WordCounter:
+    """Count words in streamed text without re-splitting what came before."""
+
+    def __init__(self):
+        self.words = 0
+        self._in_word = False
+
+    def add(self, text: str):
+        """Count the words in the next piece of text, joining words split across pieces."""
+        if not text:
+            return
+        parts = text.split()
+        if parts:
+            self.words += len(parts)
+            if self._in_word and not text[0].isspace():
+                self.words -= 1
+        self._in_word = not text[-1].isspace()
+
+class DocumentWriter:
+    """
+    Stream a document to disk as it is generated.
+
+    Pieces are appended to a .part file next to the document while the
+    word and token counts are kept incrementally, so nothing is held in
+    memory or re-counted while the document is generated. The finished file
+    is renamed into place atomically, so a partial document never replaces
+    an existing one. The local index stores the full text for its snippets,
+    so the finished document is read back once to index it.
+    """
+
+    def __init__(self, topic: str, framed: bool = True):
+        """
+        Args:
+            topic: The document topic
+            framed: Write the title header and footer around the content
+        """
+        self.topic = topic
+        self.framed = framed
+        self.path = get_document_path(topic)
+        self.counter = WordCounter()
+        self.tokens = 0
+        self.file = AtomicTextFile(self.path)
+        if framed:
+            self.file.write(format_header(topic))
+
+    @property
+    def words(self) -> int:
+        return self.counter.words
+
+    def write(self, piece: str):
+        """Append a piece of generated text."""
+        self.file.write(piece)
+        self.counter.add(piece)
+        self.tokens += 1
+
+    def close(self, success: bool = True) -> Optional[str]:
+        """
+        Finish the document, or discard it if generation failed.
+
+        Returns:
+            The document path, or None if it was discarded
+        """
+        if not success or not self.tokens:
+            self.file.discard()
+            return None
+        try:
+            if self.framed:
+                self.file.write(format_footer())
+            self.file.commit()
+        except OSError as e:
+            console.print(f"\n[red]Error creating document:[/red] {str(e)}\n")
+            return None
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            add_document(self.path, 'document', self.topic, f.read())
+        return self.path
+
 def create_document(topic: str, content: str) -> Optional[str]:
     """Create a document with the given topic and content."""
     try:
-        # Clean the topic name for use in filename
-        clean_topic = "".join(c if c.isalnum() or c in " -_" else "_" for c in topic)
-        date_str = datetime.now().strftime("%Y%m%d")
-        filename = f"{date_str}_{clean_topic}.txt"
-        
-        # Get the full path
-        full_path = os.path.join(get_default_path(), filename)
-        
-        # Write the content
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        return full_path
+        writer = DocumentWriter(topic, framed=False)
+        writer.write(content)
+        return writer.close()
     except Exception as e:
         console.print(f"\n[red]Error creating document:[/red] {str(e)}\n")
         return None
@@ -54,13 +132,19 @@ def open_document(file_path: str) -> bool:
         console.print(f"\n[red]Error opening document:[/red] {str(e)}\n")
         return False
 
-def format_content(topic: str, content: str) -> str:
-    """Format the content with proper structure."""
+def format_header(topic: str) -> str:
+    """Format the title block that starts a document."""
     return f"""{topic.title()}
 {'=' * len(topic)}
 
 Created: {datetime.now().strftime('%B %d, %Y %I:%M %p')}
 
-{content}
+"""
+
+def format_footer() -> str:
+    """Format the line that ends a document."""
+    return "\n\nGenerated by Fiber AI"
 
-Generated by Fiber AI"""
+def format_content(topic: str, content: str) -> str:
+    """Format the content with proper structure."""
+    return f"{format_header(topic)}{content}{format_footer()}"
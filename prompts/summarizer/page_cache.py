@@ -0,0 +1,150 @@
+"""On-disk cache of downloaded and extracted pages, shared between Fiber commands.
+
+Three layers are kept under ~/.fiber/cache:
+
+- pages/: the latest extraction per URL, reused without any network access
+  while it is younger than PAGE_CACHE_TTL
+- http/: the raw body of each URL with its ETag/Last-Modified validators, used
+  to revalidate with conditional requests
+- extracted/: extracted text keyed by a hash of the page body, so a page that
+  has not changed is never extracted twice
+"""
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from fiber.atomic_files import write_atomic, write_json
+
+CACHE_ROOT = Path.home() / '.fiber' / 'cache'
+
+# Extracted pages are stored as one JSON file per URL
+CACHE_DIR = CACHE_ROOT / 'pages'
+HTTP_CACHE_DIR = CACHE_ROOT / 'http'
+EXTRACTED_CACHE_DIR = CACHE_ROOT / 'extracted'
+
+# How long an extracted page is reused without touching the network (seconds)
+PAGE_CACHE_TTL = 60 * 60
+
+
+def _url_key(url: str) -> str:
+    """Get the cache key for a URL."""
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+def _cache_file(url: str) -> Path:
+    """Get the cache file path for a URL."""
+    return CACHE_DIR / f"{_url_key(url)}.json"
+
+
+def _read_json(path: Path) -> Optional[Dict]:
+    """Read a JSON cache file, or None if it is missing or corrupt."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def content_hash(body: bytes) -> str:
+    """Get the hash identifying a page body."""
+    return hashlib.sha256(body).hexdigest()
+
+
+def get_cached_page(url: str, max_age: Optional[float] = PAGE_CACHE_TTL) -> Optional[Dict]:
+    """
+    Get the cached extraction for a URL.
+
+    Args:
+        url: The URL of the page
+        max_age: Maximum age in seconds, or None to accept any age
+
+    Returns:
+        Dict with 'title', 'content' and 'metadata' or None if missing or stale
+    """
+    entry = _read_json(_cache_file(url))
+    if not entry or entry.get('url') != url or not entry.get('content'):
+        return None
+    if max_age is not None and time.time() - entry.get('fetched_at', 0) > max_age:
+        return None
+    return entry
+
+
+def store_page(url: str, title: Optional[str], content: str, metadata: Optional[Dict] = None):
+    """Store the extracted title, content and metadata of a page."""
+    try:
+        write_json(_cache_file(url), {
+            'url': url,
+            'title': title,
+            'content': content,
+            'metadata': metadata or {},
+            'fetched_at': time.time()
+        })
+    except Exception:
+        # The cache is an optimization; never fail the caller because of it
+        pass
+
+
+def get_http_entry(url: str) -> Optional[Dict]:
+    """
+    Get the cached response for a URL.
+
+    Returns:
+        Dict with 'etag', 'last_modified', 'hash' and 'body' or None if missing
+    """
+    key = _url_key(url)
+    entry = _read_json(HTTP_CACHE_DIR / f"{key}.json")
+    if not entry or entry.get('url') != url:
+        return None
+    try:
+        with open(HTTP_CACHE_DIR / f"{key}.body", 'rb') as f:
+            entry['body'] = f.read()
+    except OSError:
+        return None
+    if content_hash(entry['body']) != entry.get('hash'):
+        return None
+    return entry
+
+
+def store_http_entry(url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]) -> str:
+    """
+    Store a response body with its validators.
+
+    Returns:
+        The content hash of the body
+    """
+    digest = content_hash(body)
+    key = _url_key(url)
+    try:
+        write_atomic(HTTP_CACHE_DIR / f"{key}.body", body)
+        write_json(HTTP_CACHE_DIR / f"{key}.json", {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'hash': digest,
+            'stored_at': time.time()
+        })
+    except Exception:
+        pass
+    return digest
+
+
+def get_extraction(digest: str) -> Optional[Dict]:
+    """Get the extraction of a page body by its content hash."""
+    entry = _read_json(EXTRACTED_CACHE_DIR / f"{digest}.json")
+    if not entry or not entry.get('content'):
+        return None
+    return entry
+
+
+def store_extraction(digest: str, title: Optional[str], content: str, metadata: Optional[Dict] = None):
+    """Store the extraction of a page body under its content hash."""
+    try:
+        write_json(EXTRACTED_CACHE_DIR / f"{digest}.json", {
+            'title': title,
+            'content': content,
+            'metadata': metadata or {}
+        })
+    except Exception:
+        pass
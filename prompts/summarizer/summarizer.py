@@ -2,8 +2,9 @@ import requests
 from bs4 import BeautifulSoup
 import trafilatura
 import re
-from typing import Tuple, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Optional
 from rich.console import Console
+from rich.live import Live
 from rich.markdown import Markdown
 import os
 from dotenv import load_dotenv
@@ -11,12 +12,45 @@ import json
 from datetime import datetime
 from prompt_toolkit import prompt
 from prompt_toolkit.completion import WordCompleter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+import threading
+import time
+from urllib.parse import urlparse
+from dataclasses import dataclass, field
+
+from fiber.atomic_files import AtomicTextFile, reserve_path, write_atomic
+from fiber.local_index import add_document
+from fiber.token_budget import TokenBudget, compress_text, estimate_tokens
+from prompts.summarizer.page_cache import (
+    get_cached_page, store_page, get_http_entry, store_http_entry,
+    get_extraction, store_extraction
+)
 
 # Load environment variables
 load_dotenv()
 
 console = Console()
 
+# Tokens reserved for the generated summary and for each section's notes
+SUMMARY_OUTPUT_TOKENS = 1024
+SECTION_OUTPUT_TOKENS = 512
+
+# Instructions wrapped around each section of a long article
+SECTION_PROMPT = (
+    "Summarize part {index} of {total}{label}. Keep the key facts, figures, "
+    "names and quotes. Respond with concise bullet points only.\n\n"
+)
+COMBINE_PROMPT = (
+    "Combine these notes on consecutive sections of an article into one "
+    "concise list of bullet points, removing repetition:\n\n"
+)
+
+# Number of chunk summaries generated at the same time
+SUMMARY_WORKERS = int(os.getenv('SUMMARY_WORKERS', '3'))
+
+PROMPT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'prompt.txt')
+
 def get_ollama_model() -> str:
     """Get the Ollama model name from environment variables."""
     return os.getenv('OLLAMA_MODEL', 'llama2')  # Default to llama2 if not set
@@ -28,94 +62,157 @@ def get_default_notes_path() -> str:
         os.makedirs(default_path)
     return default_path
 
-def extract_article_content(url: str) -> Tuple[Optional[str], Optional[str]]:
+def clean_text(text: str) -> str:
+    """Collapse whitespace inside paragraphs while keeping paragraph breaks."""
+    paragraphs = (re.sub(r'\s+', ' ', line).strip() for line in text.splitlines())
+    return '\n\n'.join(p for p in paragraphs if p)
+
+@dataclass
+class Article:
+    url: str
+    title: Optional[str]
+    content: str
+    html: Optional[bytes] = None
+    metadata: Dict[str, Optional[str]] = field(default_factory=dict)
+
+def download_page(url: str) -> Tuple[bytes, str]:
     """
-    Extract the main content and title from a webpage.
+    Download the raw HTML of a webpage, revalidating any cached copy.
+    
+    A cached copy is revalidated with If-None-Match/If-Modified-Since, so an
+    unchanged page costs a 304 response instead of a full download.
+    
+    Returns:
+        Tuple of (body, content hash)
+    """
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    cached = get_http_entry(url)
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    
+    response = requests.get(url, headers=headers, timeout=15)
+    if response.status_code == 304 and cached:
+        return cached['body'], cached['hash']
+    response.raise_for_status()  # Raise error for bad status codes
+    
+    digest = store_http_entry(
+        url,
+        response.content,
+        response.headers.get('ETag'),
+        response.headers.get('Last-Modified')
+    )
+    return response.content, digest
+
+def extract_from_html(url: str, downloaded: bytes, quiet: bool = False) -> Article:
+    """Extract the main content, title and metadata from downloaded HTML."""
+    # Try trafilatura first
+    result = trafilatura.extract(
+        downloaded,
+        include_links=False,
+        include_images=False,
+        include_tables=False,
+        no_fallback=False,
+        output_format='txt'  
+    )
+    
+    metadata = trafilatura.extract_metadata(downloaded)
+    meta = {
+        key: getattr(metadata, key, None)
+        for key in ('title', 'author', 'date', 'sitename', 'description')
+    } if metadata else {}
+    
+    if result and result.strip():
+        # Clean up content
+        return Article(url=url, title=meta.get('title'), content=clean_text(result),
+                       html=downloaded, metadata=meta)
+        
+    # Fallback to BeautifulSoup
+    if not quiet:
+        console.print("[yellow]Warning:[/yellow] Primary extraction failed, trying fallback method...")
+    soup = BeautifulSoup(downloaded, 'html.parser')
+    
+    # Try to get title
+    title = meta.get('title') or (soup.title.string if soup.title else None)
+    
+    # Try to get main content
+    # Remove script, style, and nav elements
+    for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe', 'noscript']):
+        element.decompose()
+        
+    # Get text from article or main content area
+    content = ''
+    main_content = (
+        soup.find('article') or 
+        soup.find('main') or 
+        soup.find('div', {'id': re.compile(r'(content|article|post)', re.I)}) or
+        soup.find('div', {'class': re.compile(r'(content|article|post)', re.I)})
+    )
+    
+    if main_content:
+        # Remove unwanted elements from main content
+        for element in main_content(['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe']):
+            element.decompose()
+        content = main_content.get_text('\n')
+    else:
+        content = soup.get_text('\n')
+    
+    # Clean up content
+    content = clean_text(content)
+    content = re.sub(r'Share this article Share this article on.*?$', '', content, flags=re.DOTALL).strip()
+    
+    if not content:
+        raise ValueError("No content could be extracted from the webpage")
+        
+    return Article(url=url, title=title, content=content, html=downloaded, metadata=meta)
+
+def fetch_article(url: str, use_cache: bool = True, quiet: bool = False) -> Optional[Article]:
+    """
+    Download and extract a webpage once, for every stage that needs it.
     
     Args:
         url: The URL of the webpage to extract content from
+        use_cache: Reuse a recent extraction from the page cache if available
+        quiet: Suppress warnings and errors (used for background prefetching)
         
     Returns:
-        Tuple of (title, content) or (None, None) if extraction fails
+        The extracted Article or None if extraction fails
     """
     try:
         # Validate URL
         if not url.startswith(('http://', 'https://')):
             raise ValueError("Invalid URL format. URL must start with http:// or https://")
 
-        # Download webpage content
-        downloaded = trafilatura.fetch_url(url)
-        
-        if not downloaded:
-            console.print("[yellow]Warning:[/yellow] Initial download failed, trying alternative method...")
-            response = requests.get(url, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            })
-            response.raise_for_status()  # Raise error for bad status codes
-            downloaded = response.text
-
-        # Try trafilatura first
-        result = trafilatura.extract(
-            downloaded,
-            include_links=False,
-            include_images=False,
-            include_tables=False,
-            no_fallback=False,
-            output_format='txt'  
-        )
-        
-        if result:
-            # Try to extract title separately
-            metadata = trafilatura.extract_metadata(downloaded)
-            title = metadata.title if metadata and hasattr(metadata, 'title') else None
-            
-            if not result.strip():
-                raise ValueError("No content extracted from the webpage")
-                
-            # Clean up content
-            content = re.sub(r'\s+', ' ', result).strip()
-            return title, content
-            
-        # Fallback to BeautifulSoup
-        console.print("[yellow]Warning:[/yellow] Primary extraction failed, trying fallback method...")
-        soup = BeautifulSoup(downloaded, 'html.parser')
-        
-        # Try to get title
-        title = soup.title.string if soup.title else None
-        
-        # Try to get main content
-        # Remove script, style, and nav elements
-        for element in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe', 'noscript']):
-            element.decompose()
-            
-        # Get text from article or main content area
-        content = ''
-        main_content = (
-            soup.find('article') or 
-            soup.find('main') or 
-            soup.find('div', {'id': re.compile(r'(content|article|post)', re.I)}) or
-            soup.find('div', {'class': re.compile(r'(content|article|post)', re.I)})
-        )
+        # Reuse a recent extraction (e.g. prefetched by `fiber search`)
+        if use_cache:
+            cached = get_cached_page(url)
+            if cached:
+                return Article(url=url, title=cached.get('title'), content=cached['content'],
+                               metadata=cached.get('metadata') or {})
+
+        body, digest = download_page(url)
         
-        if main_content:
-            # Remove unwanted elements from main content
-            for element in main_content(['script', 'style', 'nav', 'header', 'footer', 'aside', 'iframe']):
-                element.decompose()
-            content = main_content.get_text()
+        # An unchanged page body skips extraction entirely
+        extracted = get_extraction(digest)
+        if extracted:
+            article = Article(url=url, title=extracted.get('title'), content=extracted['content'],
+                              html=body, metadata=extracted.get('metadata') or {})
         else:
-            content = soup.get_text()
+            article = extract_from_html(url, body, quiet)
+            store_extraction(digest, article.title, article.content, article.metadata)
+            add_document(url, 'article', article.title, article.content)
         
-        # Clean up content
-        content = re.sub(r'\s+', ' ', content).strip()
-        content = re.sub(r'Share this article Share this article on.*?$', '', content, flags=re.DOTALL)
-        
-        if not content:
-            raise ValueError("No content could be extracted from the webpage")
-            
-        return title, content
+        store_page(url, article.title, article.content, article.metadata)
+        return article
         
     except requests.exceptions.RequestException as e:
-        if '404' in str(e):
+        if quiet:
+            pass
+        elif '404' in str(e):
             console.print("[red]Error:[/red] Page not found (404)")
         elif '403' in str(e):
             console.print("[red]Error:[/red] Access forbidden (403). This site may be blocking automated access")
@@ -123,86 +220,244 @@ def extract_article_content(url: str) -> Tuple[Optional[str], Optional[str]]:
             console.print("[red]Error:[/red] Authentication required (401). This may be a paywall")
         else:
             console.print(f"[red]Error accessing the webpage:[/red] {str(e)}")
-        return None, None
+        return None
     except Exception as e:
-        console.print(f"[red]Error extracting content:[/red] {str(e)}")
+        if not quiet:
+            console.print(f"[red]Error extracting content:[/red] {str(e)}")
+        return None
+
+def extract_article_content(url: str, use_cache: bool = True, quiet: bool = False) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Extract the main content and title from a webpage.
+    
+    Args:
+        url: The URL of the webpage to extract content from
+        use_cache: Reuse a recent extraction from the page cache if available
+        quiet: Suppress warnings and errors (used for background prefetching)
+        
+    Returns:
+        Tuple of (title, content) or (None, None) if extraction fails
+    """
+    article = fetch_article(url, use_cache, quiet)
+    if not article:
         return None, None
+    return article.title, article.content
+
+def prefetch_articles(urls: List[str], max_workers: int = 4) -> ThreadPoolExecutor:
+    """
+    Download and extract pages in the background so a later summarize is instant.
+    
+    Args:
+        urls: The URLs to prefetch
+        max_workers: Maximum number of pages fetched at the same time
+        
+    Returns:
+        The executor running the downloads; call shutdown() to wait for them
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    for url in dict.fromkeys(urls):
+        if url and not get_cached_page(url):
+            executor.submit(fetch_article, url, True, True)
+    return executor
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text on paragraph boundaries into chunks under a token budget.
+    
+    Paragraphs larger than the budget are split on sentences, and sentences
+    larger than the budget are split on words.
+    """
+    pieces = []
+    for paragraph in text.split('\n\n'):
+        if estimate_tokens(paragraph) <= max_tokens:
+            pieces.append(paragraph)
+            continue
+        for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
+            if estimate_tokens(sentence) <= max_tokens:
+                pieces.append(sentence)
+                continue
+            words = sentence.split()
+            step = max(1, max_tokens // 2)
+            pieces.extend(' '.join(words[i:i + step]) for i in range(0, len(words), step))
+    
+    chunks = []
+    current = []
+    current_tokens = 0
+    for piece in pieces:
+        piece_tokens = estimate_tokens(piece)
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append('\n\n'.join(current))
+            current = []
+            current_tokens = 0
+        current.append(piece)
+        current_tokens += piece_tokens
+    if current:
+        chunks.append('\n\n'.join(current))
+    return chunks
+
+def _post_generate(prompt: str, model: str, stream: bool, options: Optional[Dict] = None) -> requests.Response:
+    """Send a generate request to Ollama and check the response status."""
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": stream
+    }
+    if options:
+        payload["options"] = options
+    try:
+        response = requests.post(
+            "http://localhost:11434/api/generate",
+            json=payload,
+            stream=stream
+        )
+    except requests.exceptions.ConnectionError:
+        raise ValueError("Could not connect to Ollama. Make sure it's running with 'ollama serve'")
+    
+    if response.status_code == 404:
+        raise ValueError(f"Model '{model}' not found. Please run: ollama pull {model}")
+    if response.status_code != 200:
+        raise ValueError(f"Ollama API returned status code {response.status_code}")
+    return response
+
+def generate(prompt: str, model: str, options: Optional[Dict] = None) -> str:
+    """Run a prompt through Ollama and return the generated text."""
+    response = _post_generate(prompt, model, stream=False, options=options)
+    try:
+        summary = response.json().get("response", "")
+    except (json.JSONDecodeError, AttributeError):
+        raise ValueError("Invalid response format from Ollama")
+    
+    if not summary:
+        raise ValueError("No summary in response")
+    return summary
+
+def stream_generate(prompt: str, model: str, options: Optional[Dict] = None) -> Iterator[str]:
+    """Run a prompt through Ollama and yield the text as it is generated."""
+    response = _post_generate(prompt, model, stream=True, options=options)
+    for line in response.iter_lines():
+        if not line:
+            continue
+        try:
+            chunk = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if chunk.get("error"):
+            raise ValueError(f"Ollama error: {chunk['error']}")
+        if chunk.get("response"):
+            yield chunk["response"]
+        if chunk.get("done"):
+            break
+
+def _generate_all(prompts: List[str], model: str, budget: TokenBudget,
+                  slots: Optional[threading.Semaphore] = None) -> List[str]:
+    """Run prompts concurrently, each with a context sized to fit it."""
+    def run(prompt: str) -> str:
+        with slots or nullcontext():
+            return generate(prompt, model, budget.options(prompt))
+    
+    with ThreadPoolExecutor(max_workers=SUMMARY_WORKERS) as executor:
+        return list(executor.map(run, prompts))
+
+def section_budget(model: str) -> Tuple[TokenBudget, int]:
+    """Get the budget for section prompts and the tokens left for section text."""
+    budget = TokenBudget(model, output_tokens=SECTION_OUTPUT_TOKENS)
+    instructions = SECTION_PROMPT.format(index=99, total=99, label=' of the article ""')
+    return budget, budget.available(instructions, COMBINE_PROMPT)
+
+def summarize_chunks(chunks: List[str], title: Optional[str], model: str,
+                     slots: Optional[threading.Semaphore] = None) -> List[str]:
+    """Summarize article chunks in parallel (the map step)."""
+    label = f' of the article "{title}"' if title else ''
+    prompts = [
+        SECTION_PROMPT.format(index=i, total=len(chunks), label=label) + chunk
+        for i, chunk in enumerate(chunks, 1)
+    ]
+    return _generate_all(prompts, model, section_budget(model)[0], slots)
+
+def combine_summaries(partials: List[str], model: str, max_tokens: int,
+                      slots: Optional[threading.Semaphore] = None) -> List[str]:
+    """Merge partial summaries until they fit in `max_tokens` (the reduce step)."""
+    budget, group_tokens = section_budget(model)
+    while len(partials) > 1 and estimate_tokens('\n\n'.join(partials)) > max_tokens:
+        groups = split_into_chunks('\n\n'.join(partials), group_tokens)
+        if len(groups) >= len(partials):
+            # Each partial is already as large as the budget, merge pairwise
+            groups = ['\n\n'.join(partials[i:i + 2]) for i in range(0, len(partials), 2)]
+        partials = _generate_all([COMBINE_PROMPT + group for group in groups], model, budget, slots)
+    return partials
 
-def create_summary(url: str) -> Optional[str]:
+def create_summary(article: Article, quiet: bool = False,
+                   on_token: Optional[Callable[[str], None]] = None,
+                   slots: Optional[threading.Semaphore] = None) -> Optional[str]:
     """
     Create a summary of the webpage content.
     
+    Short articles are summarized in a single prompt. Long articles are split
+    into chunks that are summarized in parallel, and the partial summaries are
+    combined hierarchically before the final summary is written.
+    
     Args:
-        url: The URL of the webpage to summarize
+        article: The extracted article to summarize
+        quiet: Skip progress messages (errors are still shown)
+        on_token: Called with each piece of the final summary as it streams in
+        slots: Limit on model calls shared with other summaries running at the same time
         
     Returns:
         A formatted summary or None if summarization fails
     """
     try:
-        # Extract content
-        title, content = extract_article_content(url)
+        title, content = article.title, article.content
         
         if not content:
             return None
             
         # Read prompt template
-        with open('prompts/summarizer/prompt.txt', 'r', encoding='utf-8') as f:
+        with open(PROMPT_FILE, 'r', encoding='utf-8') as f:
             prompt_template = f.read()
             
+        # Get the model name
+        model = get_ollama_model()
+        if not quiet:
+            console.print(f"[blue]Using model:[/blue] {model}")
+        
+        # Size the article against what the model can actually read
+        budget = TokenBudget(model, output_tokens=SUMMARY_OUTPUT_TOKENS)
+        header = f"{prompt_template}\n\nPlease summarize this article:\nTitle: {title or ''}\n\nContent: "
+        content_tokens = budget.available(header)
+        
+        if estimate_tokens(content) > content_tokens:
+            content = compress_text(content)
+        if estimate_tokens(content) > content_tokens:
+            chunks = split_into_chunks(content, section_budget(model)[1])
+            if not quiet:
+                console.print(f"[blue]Long article:[/blue] summarizing {len(chunks)} sections")
+            partials = combine_summaries(summarize_chunks(chunks, title, model, slots), model,
+                                         content_tokens, slots)
+            notes = budget.fit('\n\n'.join(partials), content_tokens)
+            content = f"Notes on the article's sections:\n{notes}"
+            
         # Prepare content for summarization
         if title:
             article_content = f"Title: {title}\n\nContent: {content}"
         else:
             article_content = f"Content: {content}"
             
-        # Get the model name
-        model = get_ollama_model()
-        console.print(f"[blue]Using model:[/blue] {model}")
-            
         # Get summary from Ollama
-        try:
-            response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": model,
-                    "prompt": f"{prompt_template}\n\nPlease summarize this article:\n{article_content}",
-                    "stream": False  # Disable streaming for now
-                }
-            )
-            
-            if response.status_code == 200:
-                try:
-                    response_json = response.json()
-                    if isinstance(response_json, dict):
-                        summary = response_json.get("response", "")
-                        if summary:
-                            return summary
-                        else:
-                            raise ValueError("No summary in response")
-                    else:
-                        raise ValueError("Invalid response format from Ollama")
-                except json.JSONDecodeError as e:
-                    # Try to handle streaming response
-                    full_response = ""
-                    for line in response.iter_lines():
-                        if line:
-                            try:
-                                chunk = json.loads(line)
-                                if isinstance(chunk, dict) and "response" in chunk:
-                                    full_response += chunk["response"]
-                            except json.JSONDecodeError:
-                                continue
-                    if full_response:
-                        return full_response
-                    else:
-                        raise ValueError("Could not parse Ollama response")
-            elif response.status_code == 404:
-                raise ValueError(f"Model '{model}' not found. Please run: ollama pull {model}")
-            else:
-                raise ValueError(f"Ollama API returned status code {response.status_code}")
-                
-        except requests.exceptions.ConnectionError:
-            raise ValueError("Could not connect to Ollama. Make sure it's running with 'ollama serve'")
+        final_prompt = f"{prompt_template}\n\nPlease summarize this article:\n{article_content}"
+        options = budget.options(final_prompt)
+        if not on_token:
+            with slots or nullcontext():
+                return generate(final_prompt, model, options)
+        
+        pieces = []
+        with slots or nullcontext():
+            for piece in stream_generate(final_prompt, model, options):
+                pieces.append(piece)
+                on_token(piece)
+        summary = "".join(pieces)
+        if not summary:
+            raise ValueError("No summary in response")
+        return summary
             
     except Exception as e:
         console.print(f"[red]Error creating summary:[/red] {str(e)}")
@@ -212,7 +467,38 @@ def create_summary(url: str) -> Optional[str]:
             console.print(f"[blue]ollama pull {model}[/blue]")
         return None
 
-def save_summary_as_note(url: str, title: Optional[str], summary: str) -> bool:
+def get_note_path(title: Optional[str]) -> str:
+    """Get the file path of the note for an article."""
+    # Create filename from title or timestamp
+    if title:
+        # Clean title for filename
+        filename = re.sub(r'[<>:"/\\|?*]', '', title)
+        filename = re.sub(r'\s+', '_', filename)
+    else:
+        filename = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+    filename = f"{filename}.md"
+    return os.path.join(get_default_notes_path(), filename)
+
+def note_header(url: str, title: Optional[str]) -> str:
+    """Get the markdown that starts a summary note."""
+    return f"""# {title or 'Article Summary'}
+
+## Source
+{url}
+
+## Summary
+"""
+
+def note_footer() -> str:
+    """Get the markdown that ends a summary note."""
+    return f"""
+---
+Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+"""
+
+def save_summary_as_note(url: str, title: Optional[str], summary: str, quiet: bool = False,
+                         unique: bool = False) -> bool:
     """
     Save the summary as a markdown note.
     
@@ -220,69 +506,224 @@ def save_summary_as_note(url: str, title: Optional[str], summary: str) -> bool:
         url: The URL of the summarized article
         title: The title of the article (if available)
         summary: The generated summary
+        quiet: Skip the confirmation message
+        unique: Never replace an existing note; a note with the same title
+            gets a numbered file name instead
         
     Returns:
         bool: True if saved successfully, False otherwise
     """
     try:
-        # Create filename from title or timestamp
-        if title:
-            # Clean title for filename
-            filename = re.sub(r'[<>:"/\\|?*]', '', title)
-            filename = re.sub(r'\s+', '_', filename)
-        else:
-            filename = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-        filename = f"{filename}.md"
-        notes_path = get_default_notes_path()
-        filepath = os.path.join(notes_path, filename)
+        filepath = get_note_path(title)
+        if unique:
+            filepath = reserve_path(filepath)
         
         # Create markdown content
-        markdown_content = f"""# {title or 'Article Summary'}
-
-## Source
-{url}
-
-## Summary
-{summary}
-
----
-Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-"""
+        markdown_content = f"{note_header(url, title)}{summary}\n{note_footer()}"
         
         # Save the file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
+        try:
+            write_atomic(filepath, markdown_content.encode('utf-8'))
+        except OSError:
+            if unique:
+                os.remove(filepath)
+            raise
+        add_document(filepath, 'note', title or url, markdown_content)
             
-        console.print(f"\n[green]Summary saved to:[/green] {filepath}")
+        if not quiet:
+            console.print(f"\n[green]Summary saved to:[/green] {filepath}")
         return True
         
     except Exception as e:
         console.print(f"[red]Error saving summary:[/red] {str(e)}")
         return False
 
-def format_summary(url: str) -> str:
-    """Format and optionally save a summary of the webpage."""
-    summary = create_summary(url)
-    if summary:
-        console.print("\n[green]Summary generated successfully![/green]\n")
-        console.print(Markdown(summary))
+class NoteWriter:
+    """
+    Write a summary note incrementally while the summary streams in.
+    
+    The note is streamed to a .part file and only replaces an existing note
+    with the same title once the summary is complete.
+    """
+    
+    def __init__(self, url: str, title: Optional[str]):
+        self.url = url
+        self.title = title
+        self.filepath = get_note_path(title)
+        self.summary = []
+        self.file = AtomicTextFile(self.filepath)
+        self.file.write(note_header(url, title))
+        self.file.flush()
+    
+    def write(self, piece: str):
+        """Append a piece of the summary to the note."""
+        self.summary.append(piece)
+        self.file.write(piece)
+        self.file.flush()
+    
+    def close(self, success: bool = True):
+        """Finish the note, or discard it if summarization failed."""
+        if not success:
+            self.file.discard()
+            return
+        try:
+            self.file.write(f"\n{note_footer()}")
+            self.file.commit()
+        except OSError as e:
+            console.print(f"[red]Error saving summary:[/red] {str(e)}")
+            return
+        content = f"{note_header(self.url, self.title)}{''.join(self.summary)}\n{note_footer()}"
+        add_document(self.filepath, 'note', self.title or self.url, content)
+        console.print(f"\n[green]Summary saved to:[/green] {self.filepath}")
+
+def format_summary(url: str, save: Optional[bool] = None) -> Optional[str]:
+    """
+    Summarize a webpage, rendering the summary live as it streams in.
+    
+    Args:
+        url: The URL of the webpage to summarize
+        save: Write the note while streaming (True), never save (False), or ask
+            once the summary is complete (None)
         
-        # Ask if user wants to save the summary
+    Returns:
+        The summary or None if summarization fails
+    """
+    # Fetch and extract once; every later stage reuses the article
+    article = fetch_article(url)
+    if not article:
+        console.print("Failed to generate summary. Please check the URL and try again.")
+        return None
+    
+    note = None
+    if save:
+        try:
+            note = NoteWriter(url, article.title)
+        except OSError as e:
+            console.print(f"[red]Error saving summary:[/red] {str(e)}")
+    
+    pieces = []
+    last_render = 0.0
+    summary = None
+    try:
+        with Live(Markdown(""), console=console, refresh_per_second=8, vertical_overflow="visible") as live:
+            def on_token(piece: str):
+                nonlocal last_render
+                pieces.append(piece)
+                if note:
+                    note.write(piece)
+                # Re-parse the markdown at most every 100ms
+                now = time.monotonic()
+                if now - last_render >= 0.1:
+                    live.update(Markdown("".join(pieces)))
+                    last_render = now
+            
+            summary = create_summary(article, on_token=on_token)
+            if summary:
+                live.update(Markdown(summary))
+    finally:
+        # Also runs on Ctrl-C, so no .part file is left behind
+        if note:
+            note.close(success=bool(summary))
+    
+    if not summary:
+        console.print("Failed to generate summary. Please check the URL and try again.")
+        return None
+    
+    console.print("\n[green]Summary generated successfully![/green]")
+    
+    # Ask if user wants to save the summary
+    if save is None:
         save_prompt = prompt("\nWould you like to save this summary as a note? (y/n): ").lower().strip()
         if save_prompt.startswith('y'):
-            # Get the title if we can
-            _, content = extract_article_content(url)
-            title = None
+            save_summary_as_note(url, article.title, summary)
+        
+    return summary
+
+def read_url_list(lines: Iterable[str]) -> List[str]:
+    """Read URLs from lines of text, skipping blanks, comments and duplicates."""
+    urls = (line.strip() for line in lines)
+    return list(dict.fromkeys(url for url in urls if url and not url.startswith('#')))
+
+def summarize_urls(urls: List[str], jsonl_path: Optional[str] = None, fetch_workers: int = 8,
+                   per_host: int = 2, llm_workers: int = 2) -> Dict[str, int]:
+    """
+    Summarize many webpages without interactive prompts.
+    
+    Pages are fetched concurrently, with at most `per_host` requests to the
+    same host at a time. Each extracted article is queued to the model as soon
+    as it is ready, and each summary is written as soon as it completes.
+    
+    Args:
+        urls: The URLs to summarize
+        jsonl_path: Append summaries as JSON lines to this file instead of writing notes
+        fetch_workers: Maximum number of pages downloaded at the same time
+        per_host: Maximum number of simultaneous downloads from one host
+        llm_workers: Maximum number of model calls running at the same time,
+            counting the section summaries of long articles
+        
+    Returns:
+        Dict with the number of 'saved' and 'failed' URLs
+    """
+    host_limits: Dict[str, threading.BoundedSemaphore] = {}
+    host_lock = threading.Lock()
+    write_lock = threading.Lock()
+    # Shared by every summary, so long articles cannot multiply the model load
+    model_slots = threading.BoundedSemaphore(max(1, llm_workers))
+    counts = {'saved': 0, 'failed': 0}
+    
+    def fetch_politely(url: str) -> Optional[Article]:
+        host = urlparse(url).netloc.lower()
+        with host_lock:
+            limit = host_limits.setdefault(host, threading.BoundedSemaphore(max(1, per_host)))
+        with limit:
+            return fetch_article(url)
+    
+    def write_result(url: str, article: Article, summary: str) -> bool:
+        if jsonl_path:
+            with write_lock, open(jsonl_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    'url': url,
+                    'title': article.title,
+                    'summary': summary,
+                    'generated_at': datetime.now().isoformat(timespec='seconds')
+                }) + '\n')
+            return True
+        # Pages with the same title each get their own note
+        return save_summary_as_note(url, article.title, summary, quiet=True, unique=True)
+    
+    def summarize_one(url: str, article: Optional[Article]) -> bool:
+        summary = create_summary(article, quiet=True, slots=model_slots) if article else None
+        return bool(summary) and write_result(url, article, summary)
+    
+    def report(url: str, article: Optional[Article], saved: bool):
+        counts['saved' if saved else 'failed'] += 1
+        if saved:
+            console.print(f"[green]✓[/green] {article.title or url}")
+        else:
+            console.print(f"[red]✗[/red] {url}")
+    
+    with ThreadPoolExecutor(max_workers=max(1, fetch_workers)) as fetcher, \
+            ThreadPoolExecutor(max_workers=max(1, llm_workers)) as summarizer:
+        fetches = {fetcher.submit(fetch_politely, url): url for url in urls}
+        summaries = {}
+        for future in as_completed(fetches):
+            url = fetches[future]
             try:
-                response = requests.get(url)
-                soup = BeautifulSoup(response.text, 'html.parser')
-                title = soup.title.string if soup.title else None
-            except:
-                pass
-                
-            save_summary_as_note(url, title, summary)
-            
-        return summary
-    else:
-        return "Failed to generate summary. Please check the URL and try again."
+                article = future.result()
+            except Exception as e:
+                console.print(f"[red]Error fetching {url}:[/red] {str(e)}")
+                report(url, None, False)
+                continue
+            summaries[summarizer.submit(summarize_one, url, article)] = (url, article)
+        
+        # Check every summary, so an exception counts as a failure instead of vanishing
+        for future in as_completed(summaries):
+            url, article = summaries[future]
+            try:
+                saved = future.result()
+            except Exception as e:
+                console.print(f"[red]Error saving summary of {url}:[/red] {str(e)}")
+                saved = False
+            report(url, article, saved)
+    
+    return counts
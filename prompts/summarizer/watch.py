@@ -0,0 +1,173 @@
+"""Change-aware re-summarization of watched URLs."""
+import difflib
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from rich.markdown import Markdown
+
+from fiber.atomic_files import write_json
+from fiber.token_budget import TokenBudget
+from prompts.summarizer.summarizer import (
+    console, create_summary, fetch_article, generate, get_ollama_model
+)
+
+# Last extracted text and summary of every watched URL
+WATCH_DIR = Path.home() / '.fiber' / 'watch'
+
+UPDATE_OUTPUT_TOKENS = 512
+
+# Updates are appended to the stored summary under this heading; only the
+# latest ones are kept so the summary sent with each diff stays small
+UPDATE_SEPARATOR = "\n\n### Update of "
+MAX_WATCH_UPDATES = 5
+
+UPDATE_PROMPT = """You previously summarized the page "{title}" as follows:
+
+{summary}
+
+The page has since changed. Sections that were removed:
+{removed}
+
+Sections that were added or rewritten:
+{added}
+
+Write a short update in Markdown describing only what changed and why it matters. \
+Use bullet points. Do not repeat information that is unchanged."""
+
+
+def _state_file(url: str) -> Path:
+    """Get the watch state file path for a URL."""
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return WATCH_DIR / f"{key}.json"
+
+
+def load_watch_state(url: str) -> Optional[Dict]:
+    """Load the last extracted text and summary of a watched URL."""
+    try:
+        with open(_state_file(url), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return state if state.get('url') == url else None
+    except (OSError, ValueError):
+        return None
+
+
+def save_watch_state(url: str, title: Optional[str], content: str, summary: str,
+                     last_update: Optional[str] = None):
+    """Save the latest extracted text and summary of a watched URL."""
+    try:
+        write_json(_state_file(url), {
+            'url': url,
+            'title': title,
+            'content': content,
+            'summary': summary,
+            'last_update': last_update,
+            'checked_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        })
+    except OSError as e:
+        # The summary was already shown; the next run just repeats this diff
+        console.print(f"[yellow]Warning: Could not save watch state: {str(e)}[/yellow]")
+
+
+def merge_update(summary: str, update: str, max_updates: int = MAX_WATCH_UPDATES) -> str:
+    """Append an update to a stored summary, keeping only the latest updates."""
+    base, *updates = summary.split(UPDATE_SEPARATOR)
+    updates.append(f"{datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n{update.strip()}")
+    return UPDATE_SEPARATOR.join([base, *updates[-max_updates:]])
+
+
+def diff_paragraphs(old: str, new: str) -> Tuple[List[str], List[str]]:
+    """
+    Compare two extractions paragraph by paragraph.
+
+    Returns:
+        Tuple of (added or rewritten paragraphs, removed paragraphs)
+    """
+    old_paragraphs = old.split('\n\n')
+    new_paragraphs = new.split('\n\n')
+    matcher = difflib.SequenceMatcher(None, old_paragraphs, new_paragraphs, autojunk=False)
+
+    added, removed = [], []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ('replace', 'insert'):
+            added.extend(new_paragraphs[j1:j2])
+        if tag in ('replace', 'delete'):
+            removed.extend(old_paragraphs[i1:i2])
+    return added, removed
+
+
+def summarize_changes(title: Optional[str], summary: str, added: List[str],
+                      removed: List[str]) -> str:
+    """Ask the model to describe the changes to a page, sending only the changed sections."""
+    model = get_ollama_model()
+    budget = TokenBudget(model, output_tokens=UPDATE_OUTPUT_TOKENS)
+    fixed = UPDATE_PROMPT.format(title=title or 'Untitled', summary=summary, removed='', added='')
+
+    # Split what is left of the budget between removed and added text, favouring additions
+    # The stored summary grows with every update; never let it crowd out the changes
+    summary = budget.fit(summary, budget.available(fixed) // 2)
+    fixed = UPDATE_PROMPT.format(title=title or 'Untitled', summary=summary, removed='', added='')
+    available = budget.available(fixed)
+    removed_text = budget.fit('\n\n'.join(removed), available // 4) if removed else '(none)'
+    added_budget = budget.available(fixed, removed_text)
+    added_text = budget.fit('\n\n'.join(added), added_budget) if added else '(none)'
+
+    prompt = UPDATE_PROMPT.format(
+        title=title or 'Untitled',
+        summary=summary,
+        removed=removed_text,
+        added=added_text
+    )
+    return generate(prompt, model, budget.options(prompt))
+
+
+def watch_summary(url: str) -> Optional[str]:
+    """
+    Summarize a URL, or only what changed since it was last summarized.
+
+    The first run stores the extracted text and full summary. Later runs diff
+    the new extraction against the stored one and send only the changed
+    paragraphs to the model, so the cost follows the size of the change.
+
+    Returns:
+        The summary or update that was shown, or None if it failed
+    """
+    article = fetch_article(url, use_cache=False)
+    if not article:
+        return None
+
+    state = load_watch_state(url)
+    if not state:
+        with console.status("[bold blue]First run, creating full summary..."):
+            summary = create_summary(article, quiet=True)
+        if not summary:
+            return None
+        save_watch_state(url, article.title, article.content, summary)
+        console.print(Markdown(summary))
+        console.print("\n[green]Watching this page; the next run will summarize only changes.[/green]")
+        return summary
+
+    added, removed = diff_paragraphs(state['content'], article.content)
+    if not added and not removed:
+        console.print(f"[green]No changes since {state['checked_at']}.[/green]\n")
+        console.print(Markdown(state['summary']))
+        save_watch_state(url, article.title, article.content, state['summary'], state.get('last_update'))
+        return state['summary']
+
+    console.print(
+        f"[blue]Changes since {state['checked_at']}:[/blue] "
+        f"{len(added)} paragraphs added or rewritten, {len(removed)} removed"
+    )
+    try:
+        with console.status("[bold blue]Summarizing changes..."):
+            update = summarize_changes(article.title, state['summary'], added, removed)
+    except Exception as e:
+        console.print(f"[red]Error creating summary:[/red] {str(e)}")
+        return None
+
+    # Later runs diff against a summary that already includes this change
+    save_watch_state(url, article.title, article.content, merge_update(state['summary'], update), update)
+    console.print(Markdown(update))
+    return update
@@ -2,10 +2,17 @@
 from datetime import datetime
 import pytz
 
+from prompts.time.timezone_index import resolve_timezone
+
 def get_current_time(timezone: str = None) -> dict:
-    """Get current time, optionally for a specific timezone."""
+    """Get current time, optionally for a place, abbreviation or timezone name."""
     try:
         if timezone:
+            resolved = resolve_timezone(timezone)
+            if not resolved:
+                print(f"Error getting time: unknown place or timezone '{timezone}'")
+                return None
+            timezone = resolved
             tz = pytz.timezone(timezone)
             current = datetime.now(tz)
         else:
@@ -0,0 +1,259 @@
+"""Resolve free-text places like "new york" or "tokyo" to IANA timezones.
+
+The index maps city names, country names, abbreviations and common aliases
+to timezone names. It is built once from the IANA database shipped with
+pytz, saved under ~/.fiber/cache and loaded lazily, so a lookup is a dict
+probe or a binary search over the sorted keys instead of a scan of every
+timezone.
+"""
+import bisect
+import difflib
+import json
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pytz
+
+from fiber.atomic_files import write_json
+
+INDEX_FILE = Path.home() / '.fiber' / 'cache' / 'timezone_index.json'
+
+# Bump when the alias table or the way the index is built changes
+INDEX_VERSION = 2
+
+# Shortest input matched as a prefix of a longer name
+MIN_PREFIX = 3
+
+# Similarity needed for a misspelled name to match
+FUZZY_CUTOFF = 0.8
+
+# Places people ask for that are not part of any timezone name
+ALIASES = {
+    'nyc': 'America/New_York',
+    'new york city': 'America/New_York',
+    'washington': 'America/New_York',
+    'dc': 'America/New_York',
+    'boston': 'America/New_York',
+    'miami': 'America/New_York',
+    'atlanta': 'America/New_York',
+    'philadelphia': 'America/New_York',
+    'houston': 'America/Chicago',
+    'dallas': 'America/Chicago',
+    'austin': 'America/Chicago',
+    'san francisco': 'America/Los_Angeles',
+    'sf': 'America/Los_Angeles',
+    'la': 'America/Los_Angeles',
+    'seattle': 'America/Los_Angeles',
+    'san diego': 'America/Los_Angeles',
+    'silicon valley': 'America/Los_Angeles',
+    'las vegas': 'America/Los_Angeles',
+    'montreal': 'America/Toronto',
+    'rio': 'America/Sao_Paulo',
+    'rio de janeiro': 'America/Sao_Paulo',
+    'uk': 'Europe/London',
+    'england': 'Europe/London',
+    'britain': 'Europe/London',
+    'great britain': 'Europe/London',
+    'scotland': 'Europe/London',
+    'edinburgh': 'Europe/London',
+    'manchester': 'Europe/London',
+    'munich': 'Europe/Berlin',
+    'frankfurt': 'Europe/Berlin',
+    'milan': 'Europe/Rome',
+    'barcelona': 'Europe/Madrid',
+    'st petersburg': 'Europe/Moscow',
+    'united kingdom': 'Europe/London',
+    'usa': 'America/New_York',
+    'us': 'America/New_York',
+    'america': 'America/New_York',
+    'beijing': 'Asia/Shanghai',
+    'peking': 'Asia/Shanghai',
+    'shenzhen': 'Asia/Shanghai',
+    'delhi': 'Asia/Kolkata',
+    'new delhi': 'Asia/Kolkata',
+    'mumbai': 'Asia/Kolkata',
+    'bombay': 'Asia/Kolkata',
+    'bangalore': 'Asia/Kolkata',
+    'bengaluru': 'Asia/Kolkata',
+    'calcutta': 'Asia/Kolkata',
+    'saigon': 'Asia/Ho_Chi_Minh',
+    'osaka': 'Asia/Tokyo',
+    'kyoto': 'Asia/Tokyo',
+    'abu dhabi': 'Asia/Dubai',
+    'uae': 'Asia/Dubai',
+    'canberra': 'Australia/Sydney',
+    # Countries whose first IANA zone is not where most people live
+    'canada': 'America/Toronto',
+    'australia': 'Australia/Sydney',
+    'brazil': 'America/Sao_Paulo',
+    'russia': 'Europe/Moscow',
+    # pytz lists Crimea first for Ukraine
+    'ukraine': 'Europe/Kyiv',
+    # "Korea (North)" and "Korea (South)" are only indexed with their qualifier
+    'korea': 'Asia/Seoul',
+    'south korea': 'Asia/Seoul',
+    'north korea': 'Asia/Pyongyang',
+    'gmt': 'UTC',
+    'utc': 'UTC',
+    'zulu': 'UTC',
+}
+
+# Abbreviations shared by several regions resolve to the most commonly meant one
+ABBREVIATIONS = {
+    'est': 'America/New_York',
+    'edt': 'America/New_York',
+    'et': 'America/New_York',
+    'cst': 'America/Chicago',
+    'cdt': 'America/Chicago',
+    'ct': 'America/Chicago',
+    'mst': 'America/Denver',
+    'mdt': 'America/Denver',
+    'mt': 'America/Denver',
+    'pst': 'America/Los_Angeles',
+    'pdt': 'America/Los_Angeles',
+    'pt': 'America/Los_Angeles',
+    'akst': 'America/Anchorage',
+    'hst': 'Pacific/Honolulu',
+    'bst': 'Europe/London',
+    'ist': 'Asia/Kolkata',
+    'cet': 'Europe/Paris',
+    'cest': 'Europe/Paris',
+    'eet': 'Europe/Athens',
+    'jst': 'Asia/Tokyo',
+    'kst': 'Asia/Seoul',
+    'aest': 'Australia/Sydney',
+    'aedt': 'Australia/Sydney',
+}
+
+
+def normalize_place(text: str) -> str:
+    """Get the index key of a place name."""
+    text = text.lower().replace('_', ' ')
+    text = re.sub(r"[^a-z0-9/+\- ]", ' ', text)
+    text = ' '.join(text.split())
+    return text[4:] if text.startswith('the ') else text
+
+
+def build_index() -> Dict[str, str]:
+    """Build the alias index from the IANA database."""
+    index: Dict[str, str] = {}
+
+    def add(key: str, zone: str):
+        key = normalize_place(key)
+        if key:
+            index.setdefault(key, zone)
+
+    # Canonical zones first so a city name maps to its own zone
+    for zone in pytz.common_timezones:
+        add(zone, zone)
+        add(zone.rsplit('/', 1)[-1], zone)
+
+    # Countries map to their first listed zone; ALIASES corrects the large ones
+    stripped = Counter(normalize_place(re.sub(r'\(.*?\)', '', name))
+                       for name in pytz.country_names.values())
+    for code, name in pytz.country_names.items():
+        zones = pytz.country_timezones.get(code)
+        if zones:
+            add(name, zones[0])
+            # "Britain (UK)" is also found as "Britain", but "Korea (North)" and
+            # "Korea (South)" share "Korea", which is left to ALIASES
+            short = normalize_place(re.sub(r'\(.*?\)', '', name))
+            if stripped[short] == 1:
+                add(short, zones[0])
+
+    for alias, zone in {**ALIASES, **ABBREVIATIONS}.items():
+        index[normalize_place(alias)] = zone
+
+    # Abbreviations as the zones report them, for winter and summer time
+    year = datetime.now().year
+    for zone in pytz.common_timezones:
+        tz = pytz.timezone(zone)
+        for month in (1, 7):
+            abbreviation = tz.localize(datetime(year, month, 1)).tzname()
+            if abbreviation and abbreviation.isalpha():
+                add(abbreviation, zone)
+
+    # Legacy names such as US/Eastern
+    for zone in pytz.all_timezones:
+        add(zone, zone)
+
+    return index
+
+
+class TimezoneIndex:
+    """Alias index with exact, prefix and fuzzy lookup."""
+
+    def __init__(self, index: Dict[str, str]):
+        self.index = index
+        self.keys: List[str] = sorted(index)
+
+    def resolve(self, text: str) -> Optional[str]:
+        """
+        Resolve a place, abbreviation or timezone name.
+
+        Returns:
+            The IANA timezone name, or None if nothing matches
+        """
+        key = normalize_place(text)
+        if not key:
+            return None
+
+        zone = self.index.get(key)
+        if zone:
+            return zone
+
+        # Shortest name starting with the input, e.g. "tok" -> "tokyo"
+        if len(key) >= MIN_PREFIX:
+            start = bisect.bisect_left(self.keys, key)
+            end = bisect.bisect_left(self.keys, key + '\uffff')
+            if start < end:
+                return self.index[min(self.keys[start:end], key=len)]
+
+        # Misspellings, e.g. "tokio" -> "tokyo"
+        matches = difflib.get_close_matches(key, self.keys, n=1, cutoff=FUZZY_CUTOFF)
+        return self.index[matches[0]] if matches else None
+
+
+def _index_version() -> str:
+    return f"{INDEX_VERSION}:{pytz.__version__}"
+
+
+def load_index(index_file: Path = INDEX_FILE) -> TimezoneIndex:
+    """Load the index from disk, building and saving it if missing or outdated."""
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == _index_version():
+            return TimezoneIndex(data['index'])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    index = build_index()
+    try:
+        write_json(index_file, {'version': _index_version(), 'index': index})
+    except Exception:
+        # A read-only home only costs rebuilding the index next time
+        pass
+    return TimezoneIndex(index)
+
+
+_index: Optional[TimezoneIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_timezone_index() -> TimezoneIndex:
+    """Get the timezone index, loading it on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = load_index()
+        return _index
+
+
+def resolve_timezone(text: str) -> Optional[str]:
+    """Resolve free text such as "new york", "Japan" or "pst" to an IANA timezone name."""
+    return get_timezone_index().resolve(text)
@@ -1,49 +1,201 @@
 """Weather functionality for Fiber."""
+import hashlib
+import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
 import requests
-from typing import Dict, Optional
 from dotenv import load_dotenv
 from rich.console import Console
 
+from fiber.atomic_files import write_json
+
 console = Console()
 
 # Load environment variables
 load_dotenv()
 
-def get_weather(city: str) -> Optional[Dict]:
-    """Get weather information for a city using OpenWeatherMap API."""
-    try:
-        API_KEY = os.getenv("OPENWEATHERMAP_API_KEY")
-        
-        if not API_KEY or API_KEY == "your_api_key_here":
+# Point this at a local stand-in server to test without the real API
+WEATHER_API_URL = os.getenv('OPENWEATHERMAP_BASE_URL', 'https://api.openweathermap.org/data/2.5')
+
+# Seconds to wait for the weather API
+WEATHER_TIMEOUT = float(os.getenv('FIBER_WEATHER_TIMEOUT', '10'))
+
+# Conditions change over minutes, so a city is fetched at most this often (seconds)
+WEATHER_CACHE_TTL = 10 * 60
+
+WEATHER_CACHE_FILE = Path.home() / '.fiber' / 'cache' / 'weather.json'
+
+# Cities looked up at once by `fiber weather London Paris Tokyo`
+WEATHER_WORKERS = 8
+
+
+def normalize_city(city: str) -> str:
+    """Get the cache key of a city name, ignoring case, spacing and trailing punctuation."""
+    return ' '.join(city.strip(' ?!.,').split()).casefold()
+
+
+class WeatherProvider:
+    """OpenWeatherMap client with a per-city TTL cache."""
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 timeout: float = WEATHER_TIMEOUT, ttl: float = WEATHER_CACHE_TTL,
+                 cache_file: Optional[Path] = WEATHER_CACHE_FILE):
+        self.api_key = api_key or os.getenv("OPENWEATHERMAP_API_KEY")
+        self.base_url = (base_url or WEATHER_API_URL).rstrip('/')
+        self.timeout = timeout
+        self.ttl = ttl
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._cache: Dict[str, Dict] = self._load_cache()
+
+    @property
+    def session(self) -> requests.Session:
+        """Get the session of the calling thread; requests sessions are not thread-safe."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _cache_key(self, city: str) -> str:
+        # Entries from a stand-in server must not be served for the real API
+        endpoint = hashlib.sha256(self.base_url.encode('utf-8')).hexdigest()[:8]
+        return f"{endpoint}:{normalize_city(city)}"
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        """Load cached conditions from file, dropping expired ones."""
+        if not self.cache_file:
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        return {key: entry for key, entry in entries.items() if now - entry.get('fetched_at', 0) <= self.ttl}
+
+    def _save_cache(self):
+        """Save cached conditions to file."""
+        if not self.cache_file:
+            return
+        with self._lock:
+            data = dict(self._cache)
+        try:
+            write_json(self.cache_file, data)
+        except Exception:
+            pass
+
+    def has_api_key(self) -> bool:
+        """Check that an API key is configured, explaining how to add one if not."""
+        if not self.api_key or self.api_key == "your_api_key_here":
             console.print("\n[red]Error:[/red] OpenWeatherMap API key not found. "
                         "Please add your API key to the .env file.\n"
                         "You can get one at: https://openweathermap.org/api\n")
-            return None
-            
-        url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={API_KEY}&units=metric"
-        
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            return {
-                "temperature": data["main"]["temp"],
-                "description": data["weather"][0]["description"],
-                "humidity": data["main"]["humidity"],
-                "wind_speed": data["wind"]["speed"]
-            }
-        elif response.status_code == 401:
-            console.print("\n[red]Error:[/red] Invalid OpenWeatherMap API key. "
-                        "Please check your API key in the .env file.\n")
-            return None
-        else:
-            console.print(f"\n[red]Error:[/red] Could not get weather for {city}. "
-                        f"Status code: {response.status_code}\n")
-            return None
-    except Exception as e:
-        console.print(f"\n[red]Error:[/red] Error getting weather: {str(e)}\n")
+            return False
+        return True
+
+    def _cached(self, city: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._cache.get(self._cache_key(city))
+        if entry and time.time() - entry['fetched_at'] <= self.ttl:
+            return entry['weather']
+        return None
+
+    def _fetch(self, city: str) -> Optional[Dict]:
+        """Fetch the current conditions of a city from the API."""
+        try:
+            response = self.session.get(
+                f"{self.base_url}/weather",
+                params={"q": city, "appid": self.api_key, "units": "metric"},
+                timeout=self.timeout
+            )
+            if response.status_code == 200:
+                data = response.json()
+                weather = {
+                    "temperature": data["main"]["temp"],
+                    "description": data["weather"][0]["description"],
+                    "humidity": data["main"]["humidity"],
+                    "wind_speed": data["wind"]["speed"]
+                }
+                with self._lock:
+                    self._cache[self._cache_key(city)] = {'weather': weather, 'fetched_at': time.time()}
+                return weather
+            elif response.status_code == 401:
+                console.print("\n[red]Error:[/red] Invalid OpenWeatherMap API key. "
+                            "Please check your API key in the .env file.\n")
+            else:
+                console.print(f"\n[red]Error:[/red] Could not get weather for {city}. "
+                            f"Status code: {response.status_code}\n")
+        except requests.Timeout:
+            console.print(f"\n[red]Error:[/red] Weather request for {city} timed out "
+                          f"after {self.timeout:g}s\n")
+        except Exception as e:
+            console.print(f"\n[red]Error:[/red] Error getting weather: {str(e)}\n")
         return None
 
+    def get(self, city: str) -> Optional[Dict]:
+        """Get the current weather of a city, from the cache when it is fresh."""
+        weather = self._cached(city)
+        if weather:
+            return weather
+        if not self.has_api_key():
+            return None
+        weather = self._fetch(city)
+        if weather:
+            self._save_cache()
+        return weather
+
+    def get_many(self, cities: List[str], max_workers: int = WEATHER_WORKERS) -> List[Tuple[str, Optional[Dict]]]:
+        """
+        Get the weather of many cities, fetching the uncached ones concurrently.
+
+        Returns:
+            List of (city, weather or None) in the order of the cities
+        """
+        results = {city: self._cached(city) for city in cities}
+        # Fetch every distinct city once, however it was spelled
+        missing = {}
+        for city in cities:
+            if results[city] is None:
+                missing.setdefault(normalize_city(city), city)
+
+        if missing and self.has_api_key():
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+                fetched = dict(zip(missing, executor.map(self._fetch, missing.values())))
+            for city in cities:
+                if results[city] is None:
+                    results[city] = fetched.get(normalize_city(city))
+            self._save_cache()
+
+        return [(city, results[city]) for city in cities]
+
+
+_provider: Optional[WeatherProvider] = None
+
+
+def get_weather_provider() -> WeatherProvider:
+    """Get the shared weather provider."""
+    global _provider
+    if _provider is None:
+        _provider = WeatherProvider()
+    return _provider
+
+
+def get_weather(city: str) -> Optional[Dict]:
+    """Get weather information for a city using OpenWeatherMap API."""
+    return get_weather_provider().get(city)
+
+
+def get_weather_many(cities: List[str]) -> List[Tuple[str, Optional[Dict]]]:
+    """Get weather information for many cities concurrently."""
+    return get_weather_provider().get_many(cities)
+
+
 def format_weather_response(weather_data: Dict) -> str:
     """Format weather data into a human-readable response."""
     return (